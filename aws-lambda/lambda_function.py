@@ -1,57 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import io
+import logging
+import os
 import urllib.parse
+import zipfile
 import boto3
+from botocore.config import Config
 
 from datetime import datetime
 
-from synop2bufr import transform as transform_synop
+from synop2bufr import parse_metadata, transform as transform_synop
 
-print('Loading function')
-s3 = boto3.client('s3')
+LOGGER = logging.getLogger()
+LOGGER.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+LOGGER.info('Loading function')
+# keep connections alive so the get/put calls share TCP/TLS sessions
+s3_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'max_attempts': 3, 'mode': 'standard'},
+    connect_timeout=3,
+    read_timeout=10
+)
+s3 = boto3.client('s3', config=s3_config)
+
+# pool used to upload the BUFR messages concurrently, boto3 clients
+# are thread safe
+executor = ThreadPoolExecutor(max_workers=16)
+
+# set BUFR_OUTPUT_ZIP to upload all messages from a file as a single zip
+# archive instead of one object per message
+BUFR_OUTPUT_ZIP = os.environ.get('BUFR_OUTPUT_ZIP', 'false').lower() == 'true'
+
+# TODO: read the metadata file from S3
+# parse the station metadata once per container, warm invocations reuse it
+with open('/function/station_list.csv', 'r') as fh:
+    STATION_METADATA = parse_metadata(fh.read())
 
 
 def handler(event, context):
 
-    # Get the object from the event
-    bucket = event['Records'][0]['s3']['bucket']['name']
-    key = urllib.parse.unquote_plus(event['Records'][0]['s3']['object']['key'], encoding='utf-8') # noqa
-    size = event['Records'][0]['s3']['object']['size']
-    print("object="+key+" received with size="+str(size))
+    # Get the object from the event, returning early for empty objects
+    s3_event = event['Records'][0]['s3']
+    size = s3_event['object']['size']
     if size == 0:
-        print("object="+key+" size=0, don't process !")
+        LOGGER.debug("object=%s size=0, don't process !",
+                     s3_event['object']['key'])
         return 0
 
+    bucket = s3_event['bucket']['name']
+    key = urllib.parse.unquote_plus(s3_event['object']['key'], encoding='utf-8') # noqa
+    LOGGER.info("object=%s received with size=%d", key, size)
+
     filename = key.split('/')[-1]
     foldername = key.replace(filename, '')
 
     response = s3.get_object(Bucket=bucket, Key=key)
-    body = response["Body"].read().decode("utf-8")
+    # SYNOP is plain ASCII, ignore stray bytes as the CLI does
+    body = response["Body"].read().decode("utf-8", errors="ignore")
 
     # TODO: extract year and month from the file name
-    year_utc = datetime.utcnow().year
-    month_utc = datetime.utcnow().month
-
-    # TODO: read the metadata file from S3
-    metadata_file = open('/function/station_list.csv', 'r')
+    now = datetime.utcnow()
+    year_utc = now.year
+    month_utc = now.month
 
     nbufr_created = 0
+    uploads = []
+    if BUFR_OUTPUT_ZIP:
+        zip_buffer = io.BytesIO()
+        zip_file = zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED)
     bufr_generator = transform_synop(
         body,
-        metadata_file.read(),
+        STATION_METADATA,
         year_utc,
         month_utc
     )
     for item in bufr_generator:
         if 'bufr4' in item and item['bufr4'] is not None:
             identifier = item['_meta']['id']
-            print('identifier='+identifier)
-            s3.put_object(
+            LOGGER.debug('identifier=%s', identifier)
+            if BUFR_OUTPUT_ZIP:
+                zip_file.writestr(identifier+'.bufr4', item['bufr4'])
+                nbufr_created += 1
+                continue
+            uploads.append(executor.submit(
+                s3.put_object,
                 Bucket='wis2box-public',
                 Key=foldername+identifier+'.bufr4',
                 Body=item['bufr4']
+            ))
+        else:
+            LOGGER.warning('No BUFR message created for %s',
+                           item['_meta']['id'])
+
+    if BUFR_OUTPUT_ZIP:
+        zip_file.close()
+        if nbufr_created > 0:
+            s3.put_object(
+                Bucket='wis2box-public',
+                Key=foldername+filename+'.zip',
+                Body=zip_buffer.getvalue()
             )
-            nbufr_created += 1
+
+    # wait for the uploads to complete and report any failures
+    wait(uploads)
+    nfailed = 0
+    for upload in uploads:
+        if upload.exception() is not None:
+            LOGGER.error('Error uploading BUFR message: %s',
+                         upload.exception())
+            nfailed += 1
         else:
-            print('No BUFR message created for '+item['_meta']['id'])
-    print('Created '+str(nbufr_created)+' BUFR messages')
+            nbufr_created += 1
+    LOGGER.info('Created %d BUFR messages', nbufr_created)
+
+    # fail the invocation so that the event is retried
+    if nfailed > 0:
+        raise RuntimeError(
+            f'{nfailed} of {len(uploads)} BUFR uploads failed for {key}')
 
     return 0
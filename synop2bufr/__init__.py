@@ -20,14 +20,17 @@
 ###############################################################################
 
 import csv
+from contextvars import ContextVar
 from copy import deepcopy
+from functools import lru_cache
 from io import StringIO
 import json
 import logging
 import math
 import os
 import re
-from typing import Iterator
+from types import MappingProxyType
+from typing import Iterator, Union
 
 # Now import pymetdecoder and csv2bufr
 from pymetdecoder import synop
@@ -37,9 +40,43 @@ __version__ = '0.7.0_dev'
 
 LOGGER = logging.getLogger(__name__)
 
-# Global arrays to store warnings and errors
-warning_msgs = []
-error_msgs = []
+# Arrays to store the warnings and errors of the conversion running in the
+# current context. They are only set while the body of a `transform`
+# generator is running, so that conversions running concurrently in
+# different threads or asyncio tasks, or interleaved in the same one, do
+# not collect each other's messages
+_warning_msgs = ContextVar('warning_msgs', default=None)
+_error_msgs = ContextVar('error_msgs', default=None)
+
+
+def _get_messages() -> tuple:
+    """
+    Returns the warning and error message arrays of the conversion running
+    in the current context. Outside of a conversion, e.g. when `parse_synop`
+    is called directly, new arrays are returned that are not kept.
+
+    :returns: `tuple` of the warning and error message arrays
+    """
+    warning_msgs = _warning_msgs.get()
+    error_msgs = _error_msgs.get()
+    if warning_msgs is None or error_msgs is None:
+        return [], []
+    return warning_msgs, error_msgs
+
+
+def _reset_messages() -> tuple:
+    """
+    Starts new warning and error message arrays for the conversion running
+    in the current context
+
+    :returns: `tuple` of the warning and error message arrays
+    """
+    warning_msgs = []
+    error_msgs = []
+    _warning_msgs.set(warning_msgs)
+    _error_msgs.set(error_msgs)
+    return warning_msgs, error_msgs
+
 
 # ! Configure the pymetdecoder/csv2bufr loggers to append warnings to the array
 
@@ -48,16 +85,14 @@ class ArrayHandler(logging.Handler):
 
     # The emit method will be called every time there is a log
     def emit(self, record):
-        # If log level is warning, append to the warnings messages array
-        if record.levelname == "WARNING":
-            warning_msgs.append(self.format(record))
+        # If log level is warning, append the pure warning message with no
+        # metadata to the warnings messages array
+        if record.levelno == logging.WARNING:
+            _get_messages()[0].append(record.getMessage())
 
 
 # Create instance of array handler
 array_handler = ArrayHandler()
-# Set format to be just the pure warning message with no metadata
-formatter = logging.Formatter('%(message)s')
-array_handler.setFormatter(formatter)
 # Set level to ensure warnings are captured
 array_handler.setLevel(logging.WARNING)
 
@@ -119,19 +154,325 @@ _keys = ['report_type', 'year', 'month', 'day',
          'precipitation_s3', 'ps3_time_period', 'precipitation_24h',
          'highest_gust_1', 'highest_gust_2']
 
-# Build the dictionary template
-synop_template = dict.fromkeys(_keys)
+# Build the dictionary template, read-only so that it can't be modified
+# in place by mistake
+synop_template = MappingProxyType(dict.fromkeys(_keys))
+
+# Cloud cover in oktas (0-8) as a percentage, rounded up by B/C10.4.4.1
+_OKTA_PERCENTAGE = (0, 13, 25, 38, 50, 63, 75, 88, 100)
+
+# Offset for converting temperatures from degrees Celsius to Kelvin
+_K0 = 273.15
+
+# Magnus formula coefficients used for the relative humidity fallback
+_BETA = 17.625
+_LAM = 243.04
+
+# Wind indicator iw as (BUFR 0 02 002 flags, BUFR template), where
+# bit 1 (left most) marks an anemometer and bit 2 marks wind in knots. Bit 3
+# should never be set for SYNOP, as units of km/h are not reportable
+_WIND_INDICATOR = {
+    0: (0b0000, 307080),
+    1: (0b1000, 307096),
+    3: (0b0100, 307080),
+    4: (0b1100, 307096)
+}
+
+# Station type ix as BUFR 0 02 001 (0 automatic, 1 manned, 2 hybrid)
+_STATION_TYPE = {0: 1, 1: 1, 2: 1, 3: 1, 4: 2, 5: 0, 6: 0, 7: 0}
+
+# Start of the maximum and minimum temperature periods (hours), keyed by
+# (region, hour of observation)
+_TEMPERATURE_PERIODS = {
+    # Extremes recorded over past 12 hours
+    **{(region, hr): (-12, -12) for hr in range(24)
+       for region in ('Antarctic', 'I', 'II', 'III', 'VI')},
+    # Extremes recorded over past 24 hours
+    **{('V', hr): (-24, -24) for hr in range(24)},
+    # In region IV the periods depend on the time of observation. At 1200 UTC
+    # the maximum is recorded over the previous day and the minimum is
+    # recorded over the previous 12 hours
+    ('IV', 0): (-12, -18),
+    ('IV', 6): (-24, -24),
+    ('IV', 12): (-36, -12),
+    ('IV', 18): (-12, -24)
+}
+
+# Degree bearing of direction codes 1 (NE) to 8 (N), as per B/C1.6.2. Codes
+# 0 and 9 have no bearing
+_BEARING = (None, 45, 90, 135, 180, 225, 270, 315, 0)
+
+# Radiation groups of section 3 as (pymetdecoder key, 1 hour element,
+# 24 hour element, rounding digits, sign). Measurements are rounded to
+# 1000s, 100s or 10000s of J/m^2 as per B/C1.12.2, and negative net and
+# upward long-wave radiation are set negative. Later groups take precedence
+_RADIATION = (
+    ('positive_net', 'net_radiation_1hr', 'net_radiation_24hr', -3, 1),
+    ('negative_net', 'net_radiation_1hr', 'net_radiation_24hr', -3, -1),
+    ('global_solar', 'global_solar_radiation_1hr',
+     'global_solar_radiation_24hr', -2, 1),
+    ('diffused_solar', 'diffuse_solar_radiation_1hr',
+     'diffuse_solar_radiation_24hr', -2, 1),
+    ('downward_long_wave', 'long_wave_radiation_1hr',
+     'long_wave_radiation_24hr', -4, 1),
+    ('upward_long_wave', 'long_wave_radiation_1hr',
+     'long_wave_radiation_24hr', -4, -1),
+    ('short_wave', 'short_wave_radiation_1hr',
+     'short_wave_radiation_24hr', -3, 1),
+    ('direct_solar', 'direct_solar_radiation_1hr',
+     'direct_solar_radiation_24hr', -2, 1)
+)
+
+# Past weather time period (hours) for each hour of observation, B/C1.10.1.8.1
+_PAST_WEATHER_PERIOD = tuple(
+    -6 if hr % 6 == 0 else -3 if hr % 3 == 0 else -2 if hr % 2 == 0 else -1
+    for hr in range(24)
+)
 
 THISDIR = os.path.dirname(os.path.realpath(__file__))
 MAPPINGS_307080 = f"{THISDIR}{os.sep}resources{os.sep}synop-mappings-307080.json"  # noqa
 MAPPINGS_307096 = f"{THISDIR}{os.sep}resources{os.sep}synop-mappings-307096.json"  # noqa
 
+# Mappings file for each BUFR template
+MAPPINGS = {
+    307080: MAPPINGS_307080,
+    307096: MAPPINGS_307096
+}
+
+
+@lru_cache(maxsize=None)
+def _load_mapping(filename: str) -> dict:
+    """
+    Loads a template mappings file on first use and caches it, so that each
+    file is only read once per process. The cached mappings are shared and
+    must be copied before being updated for each message.
+
+    :param filename: Path of the mappings file
+
+    :returns: `dict` of the template mappings
+    """
+
+    with open(filename) as fh:
+        return json.load(fh)
+
+
+def _copy_mapping(mapping: dict) -> dict:
+    """
+    Copies template mappings so that they can be updated for a message.
+    Only the header and data lists are updated, by appending or replacing
+    whole elements, so only these lists are copied and the elements
+    themselves are shared with the template.
+
+    :param mapping: Template mappings returned by `_load_mapping`
+
+    :returns: `dict` of the mappings to update
+    """
+
+    return {**mapping,
+            'header': mapping['header'].copy(),
+            'data': mapping['data'].copy()}
+
+
+@lru_cache(maxsize=None)
+def _s3_cloud_mappings(idx: int) -> tuple:
+    """
+    Builds the mappings of a section 3 group 8NsChshs, cached so that the
+    ecCodes keys are only formatted once for each group
+
+    :param idx: Index of the section 3 cloud group, starting from 0
+
+    :returns: `tuple` of the mapping elements of the cloud group
+    """
+
+    # NOTE: The following keys have been used
+    # before so the replicator has to be increased:
+    # - cloudAmount: used 2 times (Nh, Ns)
+    # - cloudType: used 4 times (CL, CM, CH, C)
+    # - heightOfBaseOfCloud: used 1 time (h)
+    # - verticalSignificance: used 7 times (for N,
+    # low-high cloud amount, low-high cloud drift)
+    return (
+        {"eccodes_key":
+            f"#{idx+6}#verticalSignificanceSurfaceObservations",
+            "value": f"data:vs_s3_{idx+1}"},
+        {"eccodes_key": f"#{idx+2}#cloudAmount",
+            "value": f"data:cloud_amount_s3_{idx+1}",
+            "valid_min": "const:0",
+            "valid_max": "const:8"},
+        {"eccodes_key": f"#{idx+5}#cloudType",
+            "value": f"data:cloud_genus_s3_{idx+1}"},
+        {"eccodes_key": f"#{idx+2}#heightOfBaseOfCloud",
+            "value": f"data:cloud_height_s3_{idx+1}"}
+    )
+
+
+@lru_cache(maxsize=None)
+def _s4_cloud_mappings(idx: int, num_s3_clouds: int, vs_s4: int) -> tuple:
+    """
+    Builds the mappings of a section 4 group N'C'H'H'Ct, cached so that the
+    ecCodes keys are only formatted once for each group
+
+    :param idx: Index of the section 4 cloud group, starting from 0
+    :param num_s3_clouds: Number of section 3 cloud groups in the report
+    :param vs_s4: Vertical significance of the cloud group (10 or 11)
+
+    :returns: `tuple` of the mapping elements of the cloud group
+    """
+
+    # NOTE: Some of the ecCodes keys are used in
+    # section 3, so we must add 'num_s3_clouds'
+    return (
+        {"eccodes_key":
+            f"#{idx+num_s3_clouds+6}#verticalSignificanceSurfaceObservations",  # noqa
+            "value": f"const:{vs_s4}"},
+        {"eccodes_key":
+            f"#{idx+num_s3_clouds+2}#cloudAmount",
+            "value": f"data:cloud_amount_s4_{idx+1}",
+            "valid_min": "const:0",
+            "valid_max": "const:8"},
+        {"eccodes_key":
+            f"#{idx+num_s3_clouds+5}#cloudType",
+            "value": f"data:cloud_genus_s4_{idx+1}"},
+        {"eccodes_key":
+            f"#{idx+1}#heightOfTopOfCloud",
+            "value": f"data:cloud_height_s4_{idx+1}"},
+        {"eccodes_key":
+            f"#{idx+1}#cloudTopDescription",
+            "value": f"data:cloud_top_s4_{idx+1}"}
+    )
+
+
+def _update_data_mapping(data: list, updates: list) -> None:
+    """
+    Updates the data mappings in place, replacing the element with the same
+    ecCodes key as each update or appending the update if there is none
+
+    :param data: List of data mapping elements
+    :param updates: List of mapping elements to add
+
+    :returns: `None`
+    """
+
+    # Position of the first element with each ecCodes key
+    positions = {}
+    for idx, element in enumerate(data):
+        positions.setdefault(element['eccodes_key'], idx)
+
+    for update in updates:
+        idx = positions.get(update['eccodes_key'])
+        if idx is None:
+            positions[update['eccodes_key']] = len(data)
+            data.append(update)
+        else:
+            data[idx] = update
+
+
+@lru_cache(maxsize=64)
+def _bufr_template(bufr_template: int, num_s3_clouds: int,
+                   num_s4_clouds: int) -> BUFRMessage:
+    """
+    Creates an empty BUFR message for the template and cloud group counts,
+    cached so that the descriptors are only expanded by ecCodes once for
+    each combination. The cached message is never parsed, use
+    `_new_bufr_message` to get a copy to fill in.
+
+    :param bufr_template: BUFR sequence of the report (307080 or 307096)
+    :param num_s3_clouds: Number of section 3 cloud groups in the report
+    :param num_s4_clouds: Number of section 4 cloud groups in the report
+
+    :returns: `BUFRMessage` with all values missing
+    """
+
+    unexpanded_descriptors = [301150, bufr_template]
+    short_delayed_replications = []
+    # update replications
+    delayed_replications = [num_s3_clouds, num_s4_clouds]
+    extended_delayed_replications = []
+    table_version = 37
+
+    return BUFRMessage(
+        unexpanded_descriptors,
+        short_delayed_replications,
+        delayed_replications,
+        extended_delayed_replications,
+        table_version)
+
+
+def _new_bufr_message(bufr_template: int, num_s3_clouds: int,
+                      num_s4_clouds: int) -> BUFRMessage:
+    """
+    Returns a new BUFR message for the template and cloud group counts,
+    copied from the cached empty message
+
+    :param bufr_template: BUFR sequence of the report (307080 or 307096)
+    :param num_s3_clouds: Number of section 3 cloud groups in the report
+    :param num_s4_clouds: Number of section 4 cloud groups in the report
+
+    :returns: `BUFRMessage` ready to be parsed
+    """
+
+    template = _bufr_template(bufr_template, num_s3_clouds, num_s4_clouds)
+
+    # Copy the whole message rather than selected attributes, so that no
+    # state of the BUFRMessage is shared between reports
+    return deepcopy(template)
+
+
+# Regular expression used to split the SYNOP tac into reports
+_AAXX_RE = re.compile(r'(AAXX\s+[0-9]{5})')
+# Regular expression matching a NIL report, capturing the station identifier
+_NIL_RE = re.compile(r'^[A-Za-z]{4} \d{5} (\d{5}) [Nn][Il][Ll]$')
+
+
+def _rh_from_dewpoint(A: float, D: float) -> float:
+    """
+    Computes relative humidity from air and dewpoint temperature using the
+    Magnus formula
+
+    :param A: Air temperature in degrees Celsius
+    :param D: Dewpoint temperature in degrees Celsius
+
+    :returns: Relative humidity in percent
+    """
+
+    return 100 * math.exp(((_BETA*D)/(_LAM+D)) - ((_BETA*A)/(_LAM+A)))
+
+
+def _get_nested(decoded: dict, *keys):
+    """
+    Walks the nested dictionary returned by pymetdecoder, returning None
+    if any of the keys are missing or their values are None, rather than
+    raising an exception.
+
+    :param decoded: Dictionary (or sub-dictionary) of the decoded SYNOP
+    :param keys: Keys to follow, in order
+
+    :returns: Value found by following the keys, or None
+    """
+    for key in keys:
+        if not isinstance(decoded, dict):
+            return None
+        decoded = decoded.get(key)
+    return decoded
+
+
+@lru_cache(maxsize=None)
+def _layer_keys(section: str, layer: int) -> tuple:
+    """
+    Returns the keys of a repeated cloud layer group in the parsed SYNOP
+    dictionary, cached so that the keys are only built once
+
+    :param section: Section of the cloud layer group, 's3' or 's4'
+    :param layer: Index of the cloud layer group, starting from 0
+
+    :returns: `tuple` of the vertical significance, cloud amount, cloud
+              genus, cloud height and cloud top keys
+    """
 
-# Load template mappings files, this will be updated for each message.
-with open(MAPPINGS_307080) as fh:
-    _mapping_307080 = json.load(fh)
-with open(MAPPINGS_307096) as fh:
-    _mapping_307096 = json.load(fh)
+    n = layer + 1
+    return (f'vs_{section}_{n}', f'cloud_amount_{section}_{n}',
+            f'cloud_genus_{section}_{n}', f'cloud_height_{section}_{n}',
+            f'cloud_top_{section}_{n}')
 
 
 def parse_synop(message: str, year: int, month: int) -> dict:
@@ -145,8 +486,8 @@ def parse_synop(message: str, year: int, month: int) -> dict:
 
     :returns: `dict` of parsed SYNOP message
     """
-    # Make warning messages array global
-    global warning_msgs
+    # Get warning messages array of the current context
+    warning_msgs, _ = _get_messages()
 
     # Get the full output decoded message from the pymetdecoder package
     try:
@@ -155,186 +496,108 @@ def parse_synop(message: str, year: int, month: int) -> dict:
         LOGGER.error("Unable to decode the SYNOP message.")
         raise e
 
-    # Get the template dictionary to be filled
-    output = deepcopy(synop_template)
+    # Get the template dictionary to be filled, all the values are None
+    # so a shallow copy (a new dict) is sufficient
+    output = synop_template.copy()
 
     # SECTIONS 0 AND 1
 
     # The following do not need to be converted
-    output['report_type'] = message[0:4]
+    output['report_type'] = message[:4]
     output['year'] = year
     output['month'] = month
 
-    if decoded.get('obs_time') is not None:
-        try:
-            output['day'] = decoded['obs_time']['day']['value']
-        except Exception:
-            output['day'] = None
-        try:
-            output['hour'] = decoded['obs_time']['hour']['value']
-        except Exception:
-            output['hour'] = None
+    obs_time = decoded.get('obs_time')
+    if obs_time is not None:
+        output['day'] = _get_nested(obs_time, 'day', 'value')
+        output['hour'] = _get_nested(obs_time, 'hour', 'value')
 
-            # The minute will be 00 unless specified by exact observation time
-    if decoded.get('exact_obs_time') is not None:
-        try:
-            output['minute'] = decoded['exact_obs_time']['minute']['value']
-        except Exception:
-            output['minute'] = None
+    # The minute will be 00 unless specified by exact observation time
+    exact_obs_time = decoded.get('exact_obs_time')
+    if exact_obs_time is not None:
+        output['minute'] = _get_nested(exact_obs_time, 'minute', 'value')
         # Overwrite the hour, because the actual observation may be from
         # the hour before but has been rounded in the YYGGiw group
-        try:
-            output['hour'] = decoded['exact_obs_time']['hour']['value']
-        except Exception:
-            output['hour'] = None
+        output['hour'] = _get_nested(exact_obs_time, 'hour', 'value')
     else:
         output['minute'] = 0
 
     # Translate wind instrument flag from the SYNOP code to the BUFR code
-    if decoded.get('wind_indicator') is not None:
-        try:
-            iw = decoded['wind_indicator']['value']
-
-            # Note bit 3 should never be set for synop, units
-            # of km/h not reportable
-            if iw == 0:
-                iw_translated = 0b0000  # Wind in m/s, default, no bits set
-                output['template'] = 307080
-            elif iw == 1:
-                iw_translated = 0b1000  # Wind in m/s with anemometer bit 1 (left most) set  # noqa
-                output['template'] = 307096
-            elif iw == 3:
-                iw_translated = 0b0100  # Wind in knots, bit 2 set
-                output['template'] = 307080
-            elif iw == 4:
-                iw_translated = 0b1100  # Wind in knots with anemometer, bits
-                # 1 and 2 set # noq
-                output['template'] = 307096
-            else:
-                iw_translated = None  # 0b1111  # Missing value
-                output['template'] = 307080
-
-            output['wind_indicator'] = iw_translated
-        except Exception:
-            output['wind_indicator'] = None
-            output['template'] = 307080
+    wind_indicator = decoded.get('wind_indicator')
+    if wind_indicator is not None:
+        iw = _get_nested(wind_indicator, 'value')
+        output['wind_indicator'], output['template'] = _WIND_INDICATOR.get(
+            iw, (None, 307080))
     else:
         output['template'] = 307080
 
-    if decoded.get('station_id') is not None:
-        try:
-            tsi = decoded['station_id']['value']
-            output['station_id'] = tsi
-            output['block_no'] = tsi[0:2]
-            output['station_no'] = tsi[2:5]
-        except Exception:
-            tsi = None
-            output['station_id'] = None
-            output['block_no'] = None
-            output['station_no'] = None
+    station_id = decoded.get('station_id')
+    tsi = _get_nested(station_id, 'value')
+    if tsi is not None:
+        output['station_id'] = tsi
+        output['block_no'] = tsi[:2]
+        output['station_no'] = tsi[2:5]
 
     # Get region of report
-    if decoded.get('region') is not None:
-        try:
-            output['region'] = decoded['region']['value']
-        except Exception:
-            output['region'] = None
+    region = decoded.get('region')
+    output['region'] = _get_nested(region, 'value')
 
     # We translate this station type flag from the SYNOP code to the BUFR code
-    if decoded.get('weather_indicator') is not None:
-        try:
-            ix = decoded['weather_indicator']['value']
-            if ix <= 3:
-                ix_translated = 1  # Manned station
-            elif ix == 4:
-                ix_translated = 2  # Hybrid station
-            elif ix > 4 and ix <= 7:
-                ix_translated = 0  # Automatic station
-            else:
-                ix_translated = None  # Missing value
-        except Exception:
-            ix_translated = None
-    else:
-        ix_translated = None  # Missing value
+    weather_indicator = decoded.get('weather_indicator')
+    ix = _get_nested(weather_indicator, 'value')
+    ix_translated = _STATION_TYPE.get(ix)
 
     output['WMO_station_type'] = ix_translated
 
     # Lowest cloud base is already given in metres, but we specifically select
     # the minimum value  # noq
     # NOTE: By B/C1.4.4.4 the precision of this value is in tens of metres
-    if decoded.get('lowest_cloud_base') is not None:
-        try:
-            output['lowest_cloud_base'] = round(decoded['lowest_cloud_base']['min'], -1)  # noqa
-        except Exception:
-            output['lowest_cloud_base'] = None
+    lowest_cloud_base = decoded.get('lowest_cloud_base')
+    h_min = _get_nested(lowest_cloud_base, 'min')
+    if h_min is not None:
+        output['lowest_cloud_base'] = round(h_min, -1)
 
     # Visibility is already given in metres
-    if decoded.get('visibility') is not None:
-        try:
-            output['visibility'] = decoded['visibility']['value']
-        except Exception:
-            output['visibility'] = None
+    visibility = decoded.get('visibility')
+    output['visibility'] = _get_nested(visibility, 'value')
 
     # Cloud cover is given in oktas, which we convert to a percentage
     #  NOTE: By B/C10.4.4.1 this percentage is always rounded up
-    if decoded.get('cloud_cover') is not None:
-        try:
-            N_oktas = decoded['cloud_cover']['_code']
-            # If the cloud cover is 9 oktas, this means the sky was obscured
-            # and we keep the value as None
-            if N_oktas == 9:
-                N_percentage = 113
-            else:
-                N_percentage = math.ceil((N_oktas / 8) * 100)
-                output['cloud_cover'] = N_percentage
-        except Exception:
-            output['cloud_cover'] = None
+    cloud_cover = decoded.get('cloud_cover')
+    N_oktas = _get_nested(cloud_cover, '_code')
+    # If the cloud cover is 9 oktas, this means the sky was obscured
+    # and we keep the value as None
+    if N_oktas is not None and N_oktas != 9:
+        output['cloud_cover'] = _OKTA_PERCENTAGE[N_oktas]
 
     # Wind direction is already in degrees
-    if decoded.get('surface_wind') is not None:
+    surface_wind = decoded.get('surface_wind')
+    if surface_wind is not None:
         # See B/C1.10.5.3
         # NOTE: Every time period in the following code shall be a negative number,  # noqa
         # to indicate measurements have been taken up until the present.
         output['wind_time_period'] = -10
 
-        try:
-
-            if decoded['surface_wind']['direction'] is not None:
-                try:
-                    output['wind_direction'] = decoded['surface_wind']['direction']['value']  # noqa
-                except Exception:
-                    output['wind_direction'] = None
-
-            # Wind speed in units specified by 'wind_indicator', convert to m/s
-            if decoded['surface_wind']['speed'] is not None:
-                try:
-                    ff = decoded['surface_wind']['speed']['value']
-                    # Find the units
-                    ff_unit = decoded['wind_indicator']['unit']
-
-                    # If units are knots instead of m/s, convert it to knots
-                    if ff_unit == 'KT':
-                        ff *= 0.51444
-                    output['wind_speed'] = ff
-                except Exception:
-                    output['wind_speed'] = None
+        output['wind_direction'] = _get_nested(surface_wind, 'direction', 'value')  # noqa
 
-        except Exception:
-            output['wind_direction'] = None
-            output['wind_speed'] = None
+        # Wind speed in units specified by 'wind_indicator', convert to m/s.
+        # If the units are unknown the speed is left missing
+        ff = _get_nested(surface_wind, 'speed', 'value')
+        ff_unit = _get_nested(wind_indicator, 'unit')
+        if ff is not None and ff_unit is not None:
+            # If units are knots instead of m/s, convert it to m/s
+            if ff_unit == 'KT':
+                ff *= 0.51444
+            output['wind_speed'] = ff
 
     # Temperatures are given in Celsius, convert to kelvin and round to 2 dp
-    if decoded.get('air_temperature') is not None:
-        try:
-            output['air_temperature'] = round(decoded['air_temperature']['value'] + 273.15, 2)  # noqa
-        except Exception:
-            output['air_temperature'] = None
+    air_temperature = _get_nested(decoded, 'air_temperature', 'value')
+    if air_temperature is not None:
+        output['air_temperature'] = round(air_temperature + _K0, 2)
 
-    if decoded.get('dewpoint_temperature') is not None:
-        try:
-            output['dewpoint_temperature'] = round(decoded['dewpoint_temperature']['value'] + 273.15, 2)  # noqa
-        except Exception:
-            output['dewpoint_temperature'] = None
+    dewpoint_temperature = _get_nested(decoded, 'dewpoint_temperature', 'value')  # noqa
+    if dewpoint_temperature is not None:
+        output['dewpoint_temperature'] = round(dewpoint_temperature + _K0, 2)
 
     # Verify that the dewpoint temperature is less than or equal to
     # the air temperature
@@ -354,155 +617,119 @@ def parse_synop(message: str, year: int, month: int) -> dict:
             output['dewpoint_temperature'] = None
 
     # RH is already given in %
-    if decoded.get('relative_humidity') is not None:
-        try:
-            output['relative_humidity'] = decoded['relative_humidity']['value']
-        except Exception:
-            output['relative_humidity'] = None
+    relative_humidity = decoded.get('relative_humidity')
+    if relative_humidity is not None:
+        output['relative_humidity'] = _get_nested(relative_humidity, 'value')
 
     else:
         # if RH is missing estimate from air temperature and dew point
         # temperature
         #
         # Reference to equation / method required
-        try:
-            A = output['air_temperature']
-            D = output['dewpoint_temperature']
-        except Exception:
-            A = None
-            D = None
+        A = output['air_temperature']
+        D = output['dewpoint_temperature']
 
-        if None in (A, D):
+        if A is None or D is None:
             output['relative_humidity'] = None
         else:
-            A -= 273.15
-            D -= 273.15
-
-            beta = 17.625
-            lam = 243.04
-
-            U = 100 * math.exp(((beta*D)/(lam+D)) - ((beta*A)/(lam+A)))
-
-            output['relative_humidity'] = U
+            output['relative_humidity'] = _rh_from_dewpoint(A - _K0, D - _K0)
 
     # Pressure is given in hPa, which we convert to Pa. By B/C 1.3.1,
     # pressure has precision in tens of Pa
-    if decoded.get('station_pressure') is not None:
-        try:
-            output['station_pressure'] = round(decoded['station_pressure']['value'] * 100, -1)  # noqa
-        except Exception:
-            output['station_pressure'] = None
+    station_pressure = _get_nested(decoded, 'station_pressure', 'value')
+    if station_pressure is not None:
+        output['station_pressure'] = round(station_pressure * 100, -1)
 
     #  Similar to above. By B/C1.3.2, pressure has precision in tens of Pa
-    if decoded.get('sea_level_pressure') is not None:
-        try:
-            output['sea_level_pressure'] = round(decoded['sea_level_pressure']['value'] * 100, -1)  # noqa
-        except Exception:
-            output['sea_level_pressure'] = None
-
-    if decoded.get('geopotential') is not None:
-        try:
-            output['isobaric_surface'] = round(decoded['geopotential']['surface']['value'] * 100, 1)  # noqa
-        except Exception:
-            output['isobaric_surface'] = None
-        try:
-            output['geopotential_height'] = decoded['geopotential']['height']['value']  # noqa
-        except Exception:
-            output['geopotential_height'] = None
-
-    if decoded.get('pressure_tendency') is not None:
+    sea_level_pressure = _get_nested(decoded, 'sea_level_pressure', 'value')
+    if sea_level_pressure is not None:
+        output['sea_level_pressure'] = round(sea_level_pressure * 100, -1)
+
+    geopotential = decoded.get('geopotential')
+    if geopotential is not None:
+        surface = _get_nested(geopotential, 'surface', 'value')
+        if surface is not None:
+            output['isobaric_surface'] = round(surface * 100, 1)
+        output['geopotential_height'] = _get_nested(geopotential, 'height', 'value')  # noqa
+
+    pressure_tendency = decoded.get('pressure_tendency')
+    if pressure_tendency is not None:
         #  By B/C1.3.3, pressure has precision in tens of Pa
-        try:
-            output['3hr_pressure_change'] = round(decoded['pressure_tendency']['change']['value'] * 100, -1)  # noqa
-        except Exception:
-            output['3hr_pressure_change'] = None
+        change = _get_nested(pressure_tendency, 'change', 'value')
+        if change is not None:
+            output['3hr_pressure_change'] = round(change * 100, -1)
 
-        try:
-            output['pressure_tendency_characteristic'] = decoded['pressure_tendency']['tendency']['value']  # noqa
-        except Exception:
-            output['pressure_tendency_characteristic'] = None
+        output['pressure_tendency_characteristic'] = _get_nested(
+            pressure_tendency, 'tendency', 'value')
 
     # Precipitation is given in mm, which is equal to kg/m^2 of rain
-    if decoded.get('precipitation_s1') is not None:
+    precipitation_s1 = decoded.get('precipitation_s1')
+    if precipitation_s1 is not None:
         # NOTE: When the precipitation measurement RRR has code 990, this
         # represents a trace amount of rain
         # (<0.01 inches), which pymetdecoder records as 0. I (RTB) agree with
         # this choice, and so no change has been made.
-        try:
-            output['precipitation_s1'] = decoded['precipitation_s1']['amount']['value']  # noqa
-        except Exception:
-            output['precipitation_s1'] = None
+        output['precipitation_s1'] = _get_nested(precipitation_s1, 'amount', 'value')  # noqa
 
-        try:
-            output['ps1_time_period'] = -1 * decoded['precipitation_s1']['time_before_obs']['value']  # noqa
-        except Exception:
-            output['ps1_time_period'] = None
+        tr = _get_nested(precipitation_s1, 'time_before_obs', 'value')
+        if tr is not None:
+            output['ps1_time_period'] = -1 * tr
 
     # The present and past weather SYNOP codes align with that of BUFR apart
     # from missing values
-    if decoded.get('present_weather') is not None:
-        try:
-            output['present_weather'] = decoded['present_weather']['value']
-        except Exception:
-            output['present_weather'] = None
+    present_weather = decoded.get('present_weather')
+    output['present_weather'] = _get_nested(present_weather, 'value')
 
-    if decoded.get('past_weather') is not None:
-        try:
-            output['past_weather_1'] = decoded['past_weather']['past_weather_1']['value']  # noqa
-        except Exception:
-            output['past_weather_1'] = None
-        try:
-            output['past_weather_2'] = decoded['past_weather']['past_weather_2']['value']  # noqa
-        except Exception:
-            output['past_weather_2'] = None
-    else:  # Missing values
-        output['past_weather_1'] = None
-        output['past_weather_2'] = None
+    past_weather = decoded.get('past_weather')
+    output['past_weather_1'] = _get_nested(past_weather, 'past_weather_1', 'value')  # noqa
+    output['past_weather_2'] = _get_nested(past_weather, 'past_weather_2', 'value')  # noqa
 
     #  The past weather time period is determined by the hour of observation,
     #  as per B/C1.10.1.8.1
     hr = output['hour']
 
     # NOTE: All time periods must be negative
-    if hr % 6 == 0:
-        output['past_weather_time_period'] = -6
-    elif hr % 3 == 0:
-        output['past_weather_time_period'] = -3
-    elif hr % 2 == 0:
-        output['past_weather_time_period'] = -2
-    else:
-        output['past_weather_time_period'] = -1
+    if hr is not None:
+        output['past_weather_time_period'] = _PAST_WEATHER_PERIOD[hr % 24]
+
+    #  Some of the cloud information is different if the overall cloud
+    # cover (N in group Nddff) is recorded as 0. This is because if it is
+    # confirmed that no clouds are present, then the remaining cloud
+    # information is automatic, and the cloud type flags need not be read
+    cloud_types = decoded.get('cloud_types')
+    if output['cloud_cover'] == 0:
+        output['cloud_vs_s1'] = 62
+        output['cloud_amount_s1'] = 0
+        output['lowest_cloud_base'] = None
+        output['low_cloud_type'] = 30
+        output['middle_cloud_type'] = 20
+        output['high_cloud_type'] = 10
 
-    # We translate these cloud type flags from the SYNOP codes to the
-    # BUFR codes
-    if decoded.get('cloud_types') is not None:
-        try:
-            Cl = decoded['cloud_types']['low_cloud_type']['value'] + 30
-        except Exception:
-            Cl = None
+    # Otherwise we translate these cloud type flags from the SYNOP codes to
+    # the BUFR codes
+    elif cloud_types is not None:
+        Cl = _get_nested(cloud_types, 'low_cloud_type', 'value')
+        if Cl is not None:
+            Cl += 30
         output['low_cloud_type'] = Cl
 
-        try:
-            Cm = decoded['cloud_types']['middle_cloud_type']['value'] + 20
-        except Exception:
-            Cm = None
-
+        Cm = _get_nested(cloud_types, 'middle_cloud_type', 'value')
+        if Cm is not None:
+            Cm += 20
         output['middle_cloud_type'] = Cm
 
-        try:
-            Ch = decoded['cloud_types']['high_cloud_type']['value'] + 10
-        except Exception:
-            Ch = None
-
+        Ch = _get_nested(cloud_types, 'high_cloud_type', 'value')
+        if Ch is not None:
+            Ch += 10
         output['high_cloud_type'] = Ch
 
-        if decoded['cloud_types'].get('low_cloud_amount') is not None:
+        low_cloud_amount = cloud_types.get('low_cloud_amount')
+        middle_cloud_amount = cloud_types.get('middle_cloud_amount')
+
+        if low_cloud_amount is not None:
             # Low cloud amount is given in oktas, and by B/C1.4.4.3.1 it
             # stays that way for BUFR
-            try:
-                N_oktas = decoded['cloud_types']['low_cloud_amount']['value']
-            except Exception:
-                N_oktas = None
+            N_oktas = low_cloud_amount.get('value')
 
             # If the cloud cover is 9 oktas, this means the sky was obscured
             # and we keep the value as None
@@ -514,13 +741,10 @@ def parse_synop(message: str, year: int, month: int) -> dict:
                 output['cloud_vs_s1'] = 7
                 output['cloud_amount_s1'] = N_oktas
 
-        elif decoded['cloud_types'].get('middle_cloud_amount') is not None:
+        elif middle_cloud_amount is not None:
             # Middle cloud amount is given in oktas, and by B/C1.4.4.3.1 it
             # stays that way for BUFR
-            try:
-                N_oktas = decoded['cloud_types']['middle_cloud_amount']['value']  # noqa
-            except Exception:
-                N_oktas = None
+            N_oktas = middle_cloud_amount.get('value')
 
             # If the cloud cover is 9 oktas, this means the sky was obscured
             # and we keep the value as None
@@ -535,7 +759,7 @@ def parse_synop(message: str, year: int, month: int) -> dict:
 
         # According to B/C1.4.4.3.1, if only high clouds present, cloud amount
         # and significance code will be set to 0
-        elif decoded['cloud_types']['high_cloud_type'] is not None:
+        elif cloud_types.get('high_cloud_type') is not None:
             output['cloud_vs_s1'] = 0
             output['cloud_amount_s1'] = 0
 
@@ -551,104 +775,43 @@ def parse_synop(message: str, year: int, month: int) -> dict:
         output['middle_cloud_type'] = 63
         output['high_cloud_type'] = 63
 
-    #  Now, some of the above cloud information may be different if the
-    # overall cloud cover
-    #  (N in group Nddff) is recorded as 0. This is because if it is confirmed
-    # that no clouds are present, then the remaining cloud
-    # information is automatic
-
-    if output['cloud_cover'] == 0:
-        # Overwrite the above in the case of no clouds
-        output['cloud_vs_s1'] = 62
-        output['cloud_amount_s1'] = 0
-        output['lowest_cloud_base'] = None
-        output['low_cloud_type'] = 30
-        output['middle_cloud_type'] = 20
-        output['high_cloud_type'] = 10
-
     # ! SECTION 3
 
     #  Group 1 1snTxTxTx - gives maximum temperature over a time period
     # decided by the region
-    if decoded.get('maximum_temperature') is not None:
+    maximum_temperature = _get_nested(decoded, 'maximum_temperature', 'value')
+    if maximum_temperature is not None:
         #  Convert to Kelvin and round to required precision
-        try:
-            output['maximum_temperature'] = decoded['maximum_temperature']['value']  # noqa
-            if output['maximum_temperature'] is not None:
-                output['maximum_temperature'] = round(output['maximum_temperature'] + 273.15, 2)  # noqa
-
-        except Exception:
-            output['maximum_temperature'] = None
+        output['maximum_temperature'] = round(maximum_temperature + _K0, 2)
 
     #  Group 2 2snTnTnTn - gives minimum temperature over a time period
     # decided by the region
-    if decoded.get('minimum_temperature') is not None:
+    minimum_temperature = _get_nested(decoded, 'minimum_temperature', 'value')
+    if minimum_temperature is not None:
         #  Convert to Kelvin and round to required precision
-        try:
-            output['minimum_temperature'] = decoded['minimum_temperature']['value']  # noqa
-            if output['minimum_temperature'] is not None:
-                output['minimum_temperature'] = round(output['minimum_temperature'] + 273.15, 2)  # noqa
-        except Exception:
-            output['minimum_temperature'] = None
+        output['minimum_temperature'] = round(minimum_temperature + _K0, 2)
 
     # Now calculate the associated time periods for the max and min temps
-    try:
-        if output['region'] in ['Antarctic', 'I', 'II', 'III', 'VI']:
-            # Extremes recorded over past 12 hours
-            output['maximum_temperature_period_start'] = -12
-            output['minimum_temperature_period_start'] = -12
-
-        elif output['region'] == 'V':
-            # Extremes recorded over past 24 hours
-            output['maximum_temperature_period_start'] = -24
-            output['minimum_temperature_period_start'] = -24
-
-        elif output['region'] == 'IV':
-            # If time is 0000 UTC, extremes recorded over 12 and 18
-            # hours respectively
-            if output['hour'] == 0:
-                output['maximum_temperature_period_start'] = -12
-                output['minimum_temperature_period_start'] = -18
-
-            # If time is 0600 UTC, extremes recorded over 24 hours
-            elif output['hour'] == 6:
-                output['maximum_temperature_period_start'] = -24
-                output['minimum_temperature_period_start'] = -24
-
-            # If time is 1200 UTC, maximum is recorded over the previous
-            # day and the minimum is recorded over the previous 12 hours
-            elif output['hour'] == 12:
-                output['maximum_temperature_period_start'] = -36
-                output['minimum_temperature_period_start'] = -12
-
-            # If time is 1800 UTC, extremes recorded over 12 and 24
-            # hours respectively
-            elif output['hour'] == 18:
-                output['maximum_temperature_period_start'] = -12
-                output['minimum_temperature_period_start'] = -24
-
-        # We now set the end of the time periods to be the time of the
-        # observation (0), unless it is the maximum temperature of
-        # the previous calendar day (when the time period started
-        # 36 hours before the observation)
-        if output['maximum_temperature_period_start'] == -36:
-            output['maximum_temperature_period_end'] = -12
-        else:
-            output['maximum_temperature_period_end'] = 0
-
-        # NOTE: I believe the minimum temperature time period always ends
-        # at the time of the observation, even for region III
-        # (see pg. 97 of the regional manual on codes). However, this
-        # is contradicted the BUFR manual (note 2 on pg. 1069) thus
-        # we define this as a variable rather than a constant in the mapping
-        # file in case changes need to be made in the future.
-        output['minimum_temperature_period_end'] = 0
-
-    except Exception:
-        output['maximum_temperature_period_start'] = None
-        output['minimum_temperature_period_start'] = None
-        output['maximum_temperature_period_end'] = None
-        output['minimum_temperature_period_end'] = None
+    (output['maximum_temperature_period_start'],
+     output['minimum_temperature_period_start']) = _TEMPERATURE_PERIODS.get(
+        (output['region'], output['hour']), (None, None))
+
+    # We now set the end of the time periods to be the time of the
+    # observation (0), unless it is the maximum temperature of
+    # the previous calendar day (when the time period started
+    # 36 hours before the observation)
+    if output['maximum_temperature_period_start'] == -36:
+        output['maximum_temperature_period_end'] = -12
+    else:
+        output['maximum_temperature_period_end'] = 0
+
+    # NOTE: I believe the minimum temperature time period always ends
+    # at the time of the observation, even for region III
+    # (see pg. 97 of the regional manual on codes). However, this
+    # is contradicted the BUFR manual (note 2 on pg. 1069) thus
+    # we define this as a variable rather than a constant in the mapping
+    # file in case changes need to be made in the future.
+    output['minimum_temperature_period_end'] = 0
 
     #  Group 3 3Ejjj
     # NOTE: According to SYNOP manual 12.4.5, the group is
@@ -656,46 +819,30 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     # This regional difference is as follows:
     # It is either omitted, or it takes form 3EsnTgTg, where
     # Tg is the ground temperature
-    if decoded.get('ground_state') is not None:
+    ground_state = decoded.get('ground_state')
+    if ground_state is not None:
         # get value
-        if decoded['ground_state']['state'] is not None:
-            try:
-                output['ground_state'] = decoded['ground_state']['state']['value']  # noqa
-            except Exception:
-                output['ground_state'] = None
-        else:
-            output['ground_state'] = None
+        output['ground_state'] = _get_nested(ground_state, 'state', 'value')
 
-        if decoded['ground_state']['temperature'] is not None:
-            try:
-                #  Convert to Kelvin
-                output['ground_temperature'] = round(decoded['ground_state']['temperature']['value'] + 273.15, 2)  # noqa
-            except Exception:
-                output['ground_temperature'] = None
+        ground_temperature = _get_nested(ground_state, 'temperature', 'value')
+        if ground_temperature is not None:
+            #  Convert to Kelvin
+            output['ground_temperature'] = round(ground_temperature + _K0, 2)
 
     #  Group 4 4E'sss - gives state of the ground with snow, and the snow
     # depth (not regional like group 3 is)
-    if decoded.get('ground_state_snow') is not None:
-        if decoded['ground_state_snow']['state'] is not None:
-            # We translate the snow depth flags from the SYNOP codes to the
-            # BUFR codes
-            try:
-                E = decoded['ground_state_snow']['state']['value']
-                if E is not None:
-                    output['ground_state'] = E + 10
-                else:
-                    output['ground_state'] = None
-            except Exception:
-                output['ground_state'] = None
+    ground_state_snow = decoded.get('ground_state_snow')
+    if ground_state_snow is not None:
+        # We translate the snow depth flags from the SYNOP codes to the
+        # BUFR codes
+        E = _get_nested(ground_state_snow, 'state', 'value')
+        if E is not None:
+            output['ground_state'] = E + 10
         else:  # Missing value
             output['ground_state'] = None
 
         # Snow depth is given in cm but should be encoded in m
-        try:
-            snow_depth = decoded['ground_state_snow']['depth']['depth']  # noqa
-        except Exception:
-            snow_depth = None
-
+        snow_depth = _get_nested(ground_state_snow, 'depth', 'depth')
         if snow_depth is not None:
             output['snow_depth'] = snow_depth * 0.01
         else:
@@ -706,47 +853,29 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     #  supplementary groups for radiation measurements
 
     # Evaporation 5EEEiE
-    if decoded.get('evapotranspiration') is not None:
+    evapotranspiration = decoded.get('evapotranspiration')
+    if evapotranspiration is not None:
 
         # Evapotranspiration is given in mm, which is equal to kg/m^2 for rain
-        try:
-            output['evapotranspiration'] = decoded['evapotranspiration']['amount']['value']  # noqa
-        except Exception:
-            output['evapotranspiration'] = None
-
-        try:
-            if decoded['evapotranspiration']['type'] is not None:
-                output['evaporation_instrument'] = decoded['evapotranspiration']['type']['_code']  # noqa
-            else:
-                # Missing value
-                output['evaporation_instrument'] = None
-        except Exception:
-            output['evaporation_instrument'] = None
+        output['evapotranspiration'] = _get_nested(evapotranspiration, 'amount', 'value')  # noqa
+        output['evaporation_instrument'] = _get_nested(evapotranspiration, 'type', '_code')  # noqa
 
     # Temperature change 54g0sndT
-    if decoded.get('temperature_change') is not None:
-
-        if decoded['temperature_change']['change'] is not None:
-            try:
-                output['temperature_change'] = decoded['temperature_change']['change']['value']  # noqa
-            except Exception:
-                output['temperature_change'] = None
+    temperature_change = decoded.get('temperature_change')
+    output['temperature_change'] = _get_nested(temperature_change, 'change', 'value')  # noqa
 
     # Sunshine amount 55SSS (24hrs) and 553SS (1hr)
-    if (decoded.get('sunshine') is not None):
-        if (decoded['sunshine'].get('amount') is not None):
+    sunshine = decoded.get('sunshine')
+    if sunshine is not None:
+        if sunshine.get('amount') is not None:
 
             # The time period remains in hours
-            try:
-                sun_time = decoded['sunshine']['duration']['value']
-            except Exception:
-                sun_time = None
+            sun_time = _get_nested(sunshine, 'duration', 'value')
 
-            try:
-                # Sunshine amount should be given in minutes
-                sun_amount = decoded['sunshine']['amount']['value'] * 60
-            except Exception:
-                sun_amount = None
+            # Sunshine amount should be given in minutes
+            sun_amount = _get_nested(sunshine, 'amount', 'value')
+            if sun_amount is not None:
+                sun_amount *= 60
 
             if sun_time == 1:
                 output['sunshine_amount_1hr'] = sun_amount
@@ -755,89 +884,37 @@ def parse_synop(message: str, year: int, month: int) -> dict:
 
     # Cloud drift data 56DLDMDH
     #  By B/C1.6.2 we must convert the direction to a degree bearing
-    def to_bearing(direction):
-        # Between NE and NW
-        if direction < 8:
-            return direction * 45
-        # N
-        if direction == 8:
-            return 0
-
-    if decoded.get('cloud_drift_direction') is not None:
-        if decoded['cloud_drift_direction']['low'] is not None:
-            try:
-                low_dir = decoded['cloud_drift_direction']['low']['_code']
-                # NOTE: If direction code is 0, the clouds are stationary or
-                # there are no clouds.
-                # If direction code is 0, the direction is unknown or the
-                # clouds or invisible.
-                # In both cases, I believe no BUFR entry should be made.
-                if low_dir > 0 and low_dir < 9:
-                    output['low_cloud_drift_direction'] = to_bearing(low_dir)
-                else:
-                    output['low_cloud_drift_direction'] = None
-            except Exception:
-                output['low_cloud_drift_direction'] = None
-
-        if decoded['cloud_drift_direction']['middle'] is not None:
-            try:
-                middle_dir = decoded['cloud_drift_direction']['middle']['_code']  # noqa
-                if middle_dir > 0 and middle_dir < 9:
-                    output['middle_cloud_drift_direction'] = to_bearing(middle_dir)  # noqa
-                else:
-                    output['middle_cloud_drift_direction'] = None
-            except Exception:
-                output['middle_cloud_drift_direction'] = None
-
-        if decoded['cloud_drift_direction']['high'] is not None:
-            try:
-                high_dir = decoded['cloud_drift_direction']['high']['_code']
-                if high_dir > 0 and high_dir < 9:
-                    output['high_cloud_drift_direction'] = to_bearing(high_dir)
-                else:
-                    output['high_cloud_drift_direction'] = None
-            except Exception:
-                output['high_cloud_drift_direction'] = None
+    # NOTE: If direction code is 0, the clouds are stationary or there
+    # are no clouds.
+    # If direction code is 9, the direction is unknown or the clouds
+    # are invisible.
+    # In both cases, I believe no BUFR entry should be made.
+    cloud_drift_direction = decoded.get('cloud_drift_direction')
+    if cloud_drift_direction is not None:
+        for level in ('low', 'middle', 'high'):
+            drift_dir = _get_nested(cloud_drift_direction, level, '_code')
+            if drift_dir is not None and 0 < drift_dir < 9:
+                output[f'{level}_cloud_drift_direction'] = _BEARING[drift_dir]  # noqa
 
     # Direction and elevation angle of the clouds 57CDaeC
-    if decoded.get('cloud_elevation') is not None:
-        if decoded['cloud_elevation']['genus'] is not None:
-            try:
-                output['e_cloud_genus'] = decoded['cloud_elevation']['genus']['_code']  # noqa
-            except Exception:
-                output['e_cloud_genus'] = None
+    cloud_elevation = decoded.get('cloud_elevation')
+    if cloud_elevation is not None:
+        output['e_cloud_genus'] = _get_nested(cloud_elevation, 'genus', '_code')  # noqa
+
+        # We reuse the bearings from above
+        e_dir = _get_nested(cloud_elevation, 'direction', '_code')
+        if e_dir is not None and 0 < e_dir < 9:
+            output['e_cloud_direction'] = _BEARING[e_dir]
         else:
-            # Missing value
-            output['e_cloud_genus'] = None
+            output['e_cloud_direction'] = None
 
-        if decoded['cloud_elevation']['direction'] is not None:
-            try:
-                e_dir = decoded['cloud_elevation']['direction']['_code']
-            except Exception:
-                e_dir = None
-
-            # NOTE: If direction code is 0, the clouds are stationary or there
-            # are no clouds.
-            # If direction code is 0, the direction is unknown or the clouds
-            # or invisible.
-            # In both cases, I believe no BUFR entry should be made.
-            if e_dir > 0 and e_dir < 9:
-                # We reuse the to_bearing function from above
-                output['e_cloud_direction'] = to_bearing(e_dir)
-            else:
-                output['e_cloud_direction'] = None
-        try:
-            output['e_cloud_elevation'] = decoded['cloud_elevation']['elevation']['value']  # noqa
-        except Exception:
-            output['e_cloud_elevation'] = None
+        output['e_cloud_elevation'] = _get_nested(cloud_elevation, 'elevation', 'value')  # noqa
 
     # Positive 58p24p24p24 or negative 59p24p24p24 changes in surface pressure
     # over 24hrs
-    if decoded.get('pressure_change') is not None:
-        try:
-            output['24hr_pressure_change'] = round(decoded['pressure_change']['value']*100, -1)  # noqa
-        except Exception:
-            output['24hr_pressure_change'] = None
+    pressure_change = _get_nested(decoded, 'pressure_change', 'value')
+    if pressure_change is not None:
+        output['24hr_pressure_change'] = round(pressure_change*100, -1)
 
     # Radiation supplementary information - the following radiation types are:
     # 1) Positive net radiation
@@ -853,167 +930,34 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     # In either case, B/C1.12.2 requires that all radiation measurements
     # are given in J/m^2. We convert this here.
 
-    if decoded.get('radiation') is not None:
-        rad_dict = decoded['radiation']
-        # Create a function to do the appropriate conversion depending
-        # on time period
-
-        def rad_convert(rad, time):
+    rad_dict = decoded.get('radiation')
+    if rad_dict is not None:
+        for group, key_1hr, key_24hr, digits, sign in _RADIATION:
+            rad = _get_nested(rad_dict, group, 'value')
+            time = _get_nested(rad_dict, group, 'time_before_obs', 'value')
+            if rad is None or time is None:
+                continue
             if time == 1:
                 # 1 kJ/m^2 = 1000 J/m^2
-                return 1000 * rad
+                output[key_1hr] = sign * round(1000 * rad, digits)
             elif time == 24:
                 # 1 J/cm^2 = 10000 J/m^2
-                return 10000 * rad
-
-        if 'positive_net' in rad_dict:
-            try:
-                rad = rad_dict['positive_net']['value']
-                time = rad_dict['positive_net']['time_before_obs']['value']  # noqa
-            except Exception:
-                rad = None
-                time = None
-            if None not in (rad, time):
-                if time == 1:
-                    #  Convert to J/m^2,rounding to 1000s of J/m^2 (B/C1.12.2)
-                    output['net_radiation_1hr'] = round(rad_convert(rad, time), -3)  # noqa
-                elif time == 24:
-                    #  Convert to J/m^2,rounding to 1000s of J/m^2 (B/C1.12.2)
-                    output['net_radiation_24hr'] = round(rad_convert(rad, time), -3)  # noqa
-
-        if 'negative_net' in rad_dict:
-            try:
-                rad = rad_dict['negative_net']['value']
-                time = rad_dict['negative_net']['time_before_obs']['value']  # noqa
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Set negative and convert to J/m^2,rounding to 1000s
-                    # of J/m^2 (B/C1.12.2)
-                    output['net_radiation_1hr'] = -1 * round(rad_convert(rad, time), -3)  # noqa
-                elif time == 24:
-                    #  Set negative and convert to J/m^2,rounding to 1000s
-                    # of J/m^2 (B/C1.12.2)
-                    output['net_radiation_24hr'] = -1 * round(rad_convert(rad, time), -3)  # noqa
-
-        if 'global_solar' in rad_dict:
-            try:
-                rad = rad_dict['global_solar']['value']
-                time = rad_dict['global_solar']['time_before_obs']['value']
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Convert to J/m^2,rounding to 100s of J/m^2 (B/C1.12.2)
-                    output['global_solar_radiation_1hr'] = round(rad_convert(rad, time), -2)  # noqa
-                elif time == 24:
-                    #  Convert to J/m^2,rounding to 100s of J/m^2 (B/C1.12.2)
-                    output['global_solar_radiation_24hr'] = round(rad_convert(rad, time), -2)  # noqa
-
-        if 'diffused_solar' in rad_dict:
-            try:
-                rad = rad_dict['diffused_solar']['value']
-                time = rad_dict['diffused_solar']['time_before_obs']['value']
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Convert to J/m^2,rounding to 100s of J/m^2 (B/C1.12.2)
-                    output['diffuse_solar_radiation_1hr'] = round(rad_convert(rad, time), -2)  # noqa
-                elif time == 24:
-                    #  Convert to J/m^2,rounding to 100s of J/m^2 (B/C1.12.2)
-                    output['diffuse_solar_radiation_24hr'] = round(rad_convert(rad, time), -2)  # noqa
-
-        if 'downward_long_wave' in rad_dict:
-            try:
-                rad = rad_dict['downward_long_wave']['value']
-                time = rad_dict['downward_long_wave']['time_before_obs']['value']  # noqa
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Set positive and convert to J/m^2,rounding to 10000s
-                    # of J/m^2 (B/C1.12.2)
-                    output['long_wave_radiation_1hr'] = round(rad_convert(rad, time), -4)  # noqa
-                elif time == 24:
-                    #  Set positive and convert to J/m^2,rounding to 10000s
-                    # of J/m^2 (B/C1.12.2)
-                    output['long_wave_radiation_24hr'] = round(rad_convert(rad, time), -4)  # noqa
-
-        if 'upward_long_wave' in rad_dict:
-            try:
-                rad = rad_dict['upward_long_wave']['value']
-                time = rad_dict['upward_long_wave']['time_before_obs']['value']  # noqa
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Set negative and convert to J/m^2,rounding to 10000s
-                    # of J/m^2 (B/C1.12.2)
-                    output['long_wave_radiation_1hr'] = -1 * round(rad_convert(rad, time), -4)  # noqa
-                elif time == 24:
-                    #  Set negative and convert to J/m^2,rounding to 10000s
-                    # of J/m^2 (B/C1.12.2)
-                    output['long_wave_radiation_24hr'] = -1 * round(rad_convert(rad, time), -4)  # noqa
-
-        if 'short_wave' in rad_dict:
-            try:
-                rad = rad_dict['short_wave']['value']
-                time = rad_dict['short_wave']['time_before_obs']['value']  # noqa
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Convert to J/m^2,rounding to 1000s of J/m^2 (B/C1.12.2)
-                    output['short_wave_radiation_1hr'] = round(rad_convert(rad, time), -3)  # noqa
-                if time == 24:
-                    #  Convert to J/m^2,rounding to 1000s of J/m^2 (B/C1.12.2)
-                    output['short_wave_radiation_24hr'] = round(rad_convert(rad, time), -3)  # noqa
-
-        if 'direct_solar' in rad_dict:
-            try:
-                rad = rad_dict['direct_solar']['value']
-                time = rad_dict['direct_solar']['time_before_obs']['value']  # noqa
-            except Exception:
-                rad = None
-                time = None
-
-            if None not in (rad, time):
-                if time == 1:
-                    #  Convert to J/m^2,rounding to 100s of J/m^2 (B/C1.12.2)
-                    output['direct_solar_radiation_1hr'] = round(rad_convert(rad, time), -2)  # noqa
-                elif time == 24:
-                    #  Convert to J/m^2,rounding to 100s of J/m^2 (B/C1.12.2)
-                    output['direct_solar_radiation_24hr'] = round(rad_convert(rad, time), -2)  # noqa
+                output[key_24hr] = sign * round(10000 * rad, digits)
 
     #  Group 6 6RRRtR - this is the same group as that in section 1, but over
     # a different time period tR
     #  (which is not a multiple of 6 hours as it is in section 1)
-    if decoded.get('precipitation_s3') is not None:
+    precipitation_s3 = decoded.get('precipitation_s3')
+    if precipitation_s3 is not None:
         # In SYNOP it is given in mm, and in BUFR it is required to be
         # in kg/m^2 (1mm = 1kg/m^2 for water)
-        try:
-            output['precipitation_s3'] = decoded['precipitation_s3']['amount']['value']  # noqa
-        except Exception:
-            output['precipitation_s3'] = None
+        output['precipitation_s3'] = _get_nested(precipitation_s3, 'amount', 'value')  # noqa
 
-        try:
-            # The time period is expected to be in hours
-            output['ps3_time_period'] = -1 * decoded['precipitation_s3']['time_before_obs']['value']  # noqa
-        except Exception:
+        # The time period is expected to be in hours
+        tr = _get_nested(precipitation_s3, 'time_before_obs', 'value')
+        if tr is not None:
+            output['ps3_time_period'] = -1 * tr
+        else:
             # Regional manual (1/12.11, 2/12.12, 3/12.10, etc.) states that
             # the precipitation time period is 3 hours,
             # or another period required for regional exchange.
@@ -1023,25 +967,20 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     # Precipitation indicator iR is needed to determine whether the
     # section 1 and section 3 precipitation groups are missing because there
     # is no data, or because there has been 0 precipitation observed
-    if decoded.get('precipitation_indicator') is not None:
-        if decoded['precipitation_indicator'].get('value') is not None:
-
-            iR = decoded['precipitation_indicator']['value']
+    iR = _get_nested(decoded, 'precipitation_indicator', 'value')
 
-            # iR = 3 means 0 precipitation observed
-            if iR == 3:
-                output['precipitation_s1'] = 0
-                output['precipitation_s3'] = 0
+    # iR = 3 means 0 precipitation observed
+    if iR == 3:
+        output['precipitation_s1'] = 0
+        output['precipitation_s3'] = 0
 
     #  Group 7 7R24R24R24R24 - this group is the same as group 6, but
     # over a 24 hour time period
-    if decoded.get('precipitation_24h') is not None:
+    precipitation_24h = decoded.get('precipitation_24h')
+    if precipitation_24h is not None:
         # In SYNOP it is given in mm, and in BUFR it is required to be
         # in kg/m^2 (1mm = 1kg/m^2 for water)
-        try:
-            output['precipitation_24h'] = decoded['precipitation_24h']['amount']['value']  # noqa
-        except Exception:
-            output['precipitation_24h'] = None
+        output['precipitation_24h'] = _get_nested(precipitation_24h, 'amount', 'value')  # noqa
 
     # Group 8 8NsChshs - information about a layer or mass of cloud.
     # This group can be repeated for up to 4 cloud genuses that are witnessed,
@@ -1050,78 +989,69 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     # Create number of s3 group 8 clouds variable, in case there is no group 8
     num_s3_clouds = 0
 
-    if decoded.get('cloud_layer') is not None:
-
-        # Name the array of 8NsChshs groups
-        genus_array = decoded['cloud_layer']
+    # Name the array of 8NsChshs groups
+    genus_array = decoded.get('cloud_layer')
+    if genus_array is not None:
 
         # Get the number of 8NsChshs groups in the SYNOP message
         num_s3_clouds = len(genus_array)
 
-        # For each cloud genus...
-        for i in range(num_s3_clouds):
+        # The vertical significance is determined by the number of clouds
+        # given and whether it is a
+        # Cumulonimbus cloud, by B/C1.4.5.2.1. Moreover, it also depends
+        # on whether the station is automatic
+        # (WMO_station_type = 0). We implement this below:
 
-            # The vertical significance is determined by the number of clouds
-            # given and whether it is a
-            # Cumulonimbus cloud, by B/C1.4.5.2.1. Moreover, it also depends
-            # on whether the station is automatic
-            # (WMO_station_type = 0). We implement this below:
+        # We create a boolean variable, which yields True if the station
+        # is automatic
+        automatic_state = output['WMO_station_type'] == 0
 
-            # We create a boolean variable, which yields True if the station
-            # is automatic
-            automatic_state = bool(output['WMO_station_type'] == 0)
+        # For each cloud genus...
+        for i, layer in enumerate(genus_array):
+            vs_key, amount_key, genus_key, height_key, _ = _layer_keys('s3', i)  # noqa
 
-            if genus_array[i]['cloud_genus'] is not None:
-                try:
-                    C_code = genus_array[i]['cloud_genus']['_code']
-                    output[f'cloud_genus_s3_{i+1}'] = C_code
+            if layer['cloud_genus'] is not None:
+                C_code = _get_nested(layer, 'cloud_genus', '_code')
+                output[genus_key] = C_code
 
-                    if C_code == 9:  # Cumulonimbus
-                        if automatic_state:
-                            output[f'vs_s3_{i+1}'] = 24
-                        else:
-                            output[f'vs_s3_{i+1}'] = 4
+                if C_code == 9:  # Cumulonimbus
+                    if automatic_state:
+                        output[vs_key] = 24
+                    else:
+                        output[vs_key] = 4
 
-                    else:  # Non-Cumulonimbus
-                        if automatic_state:
-                            output[f'vs_s3_{i+1}'] = i+21
-                        else:
-                            output[f'vs_s3_{i+1}'] = i+1
-                except Exception:
-                    output[f'vs_s3_{i + 1}'] = None
+                else:  # Non-Cumulonimbus
+                    if automatic_state:
+                        output[vs_key] = i+21
+                    else:
+                        output[vs_key] = i+1
             else:
                 # Missing value
-                output[f'cloud_genus_s3_{i+1}'] = None
+                output[genus_key] = None
                 if automatic_state:
-                    output[f'vs_s3_{i+1}'] = 20
+                    output[vs_key] = 20
                 else:
-                    output[f'vs_s3_{i+1}'] = None
+                    output[vs_key] = None
 
-            if genus_array[i]['cloud_cover'] is not None:
+            if layer['cloud_cover'] is not None:
                 # This is left in oktas just like group 8 in section 1
-                try:
-                    N_oktas = genus_array[i]['cloud_cover']['value']
-                except Exception:
-                    N_oktas = None
+                N_oktas = _get_nested(layer, 'cloud_cover', 'value')
 
                 # If the cloud cover is 9 oktas, this means the sky was
                 # obscured and we keep the value as None
                 if N_oktas == 9:
                     # Replace vertical significance code in this case
-                    output[f'vs_s3_{i+1}'] = 5
+                    output[vs_key] = 5
                 else:
-                    output[f'cloud_amount_s3_{i+1}'] = N_oktas
+                    output[amount_key] = N_oktas
             else:
                 # Missing value
-                output[f'cloud_amount_s3_{i+1}'] = None
+                output[amount_key] = None
 
-            if genus_array[i]['cloud_height'] is not None:
+            if layer['cloud_height'] is not None:
                 # In SYNOP the code table values correspond to heights in m,
                 # which BUFR requires
-                try:
-                    output[f'cloud_height_s3_{i+1}'] = genus_array[i]['cloud_height']['value']  # noqa
-                except Exception:
-                    output[f'cloud_height_s3_{i + 1}'] = None
+                output[height_key] = _get_nested(layer, 'cloud_height', 'value')  # noqa
 
     #  Group 9 9SpSpspsp is regional supplementary information and is
     #   mostly not present in the B/C1 regulations.
@@ -1129,15 +1059,10 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     #  wind gust speed for region VI (groups 910fmfm and 911fxfx).
     #  These are given and required to be in m/s.
 
-    if decoded.get('highest_gust') is not None:
-        try:
-            output['highest_gust_1'] = decoded['highest_gust']['gust_1']['speed']['value']  # noqa
-        except Exception:
-            output['highest_gust_1'] = None
-        try:
-            output['highest_gust_2'] = decoded['highest_gust']['gust_2']['speed']['value']  # noqa
-        except Exception:
-            output['highest_gust_2'] = None
+    highest_gust = decoded.get('highest_gust')
+    if highest_gust is not None:
+        output['highest_gust_1'] = _get_nested(highest_gust, 'gust_1', 'speed', 'value')  # noqa
+        output['highest_gust_2'] = _get_nested(highest_gust, 'gust_2', 'speed', 'value')  # noqa
 
     # ! SECTION 4
 
@@ -1152,22 +1077,22 @@ def parse_synop(message: str, year: int, month: int) -> dict:
     # Create number of s4 clouds variable, in case there are no s4 groups
     num_s4_clouds = 0
 
-    if decoded.get('section4') is not None:
-
-        # Name the array of section 4 items
-        genus_array = decoded['section4']
+    # Name the array of section 4 items
+    genus_array = decoded.get('section4')
+    if genus_array is not None:
 
         # Get the number of section 4 groups in the SYNOP message
         num_s4_clouds = len(genus_array)
 
         # For each cloud genus with base below station level...
-        for i in range(num_s4_clouds):
+        for i, group in enumerate(genus_array):
+            _, amount_key, genus_key, height_key, top_key = _layer_keys('s4', i)  # noqa
 
             # Get cloud information codes
-            cloud_amount = genus_array[i][0]
-            cloud_genus = genus_array[i][1]
-            cloud_height = genus_array[i][2:4]
-            cloud_top = genus_array[i][4]
+            cloud_amount = group[0]
+            cloud_genus = group[1]
+            cloud_height = group[2:4]
+            cloud_top = group[4]
 
             #  We now take a different approach, by updating the template
             # dictionary keys where necessary
@@ -1175,26 +1100,26 @@ def parse_synop(message: str, year: int, month: int) -> dict:
             # Now we convert the code string to an integer, and check that
             # there aren't missing values
             if cloud_amount != '/':
-                output[f'cloud_amount_s4_{i+1}'] = int(cloud_amount)
+                output[amount_key] = int(cloud_amount)
             else:
                 # Missing value
-                output[f'cloud_amount_s4_{i+1}'] = 15
+                output[amount_key] = 15
 
             if cloud_genus != '/':
-                output[f'cloud_genus_s4_{i+1}'] = int(cloud_genus)
+                output[genus_key] = int(cloud_genus)
             else:
                 # Missing value
-                output[f'cloud_genus_s4_{i+1}'] = 63
+                output[genus_key] = 63
 
             if cloud_height != '//':
                 # Multiply by 100 to get metres (B/C1.5.2.4)
-                output[f'cloud_height_s4_{i+1}'] = int(cloud_height) * 100
+                output[height_key] = int(cloud_height) * 100
 
             if cloud_top != '/':
-                output[f'cloud_top_s4_{i+1}'] = int(cloud_top)
+                output[top_key] = int(cloud_top)
             else:
                 # Missing value
-                output[f'cloud_top_s4_{i+1}'] = 15
+                output[top_key] = 15
 
     # ! Return the new dictionary and the number of groups in section 4
     return output, num_s3_clouds, num_s4_clouds
@@ -1219,7 +1144,7 @@ def extract_individual_synop(data: str) -> list:
         )
 
     # Split the string by AAXX YYGGiw
-    data = re.split(r'(AAXX\s+[0-9]{5})', data[start_position:])
+    data = _AAXX_RE.split(data[start_position:])
 
     # Check if the beginning of the message (e.g. ZCZC 123 etc.)
     # that we're about to throw away (data[0]) also contains AAXX.
@@ -1236,7 +1161,8 @@ def extract_individual_synop(data: str) -> list:
     messages = []
     for d in data:
         if "AAXX" in d:
-            s0 = d
+            # Section 0 groups, with any whitespace normalised
+            s0 = " ".join(d.split())
         else:
             if "=" not in d:
                 raise ValueError((
@@ -1244,49 +1170,138 @@ def extract_individual_synop(data: str) -> list:
                     " thus unable to identify separate SYNOP reports."
                 ))
 
-            d = re.sub(r"\n+", " ", d)
-            d = re.sub(r"\x03", "", d)
-            _messages = d.split("=")
-            num_msg = len(_messages)
-            for idx in range(num_msg):
-                # if len(_messages[idx]) > 0:
-                if len(re.sub(r"\s+", "", f"{_messages[idx]}")) > 0:
-                    _messages[idx] = \
-                        re.sub(r"\s+", " ", f"{s0} {_messages[idx]}")
-                    # messages.extend(
-                    # re.sub(r"\s+", " ", f"{s0} {_messages[idx]}")
-                    # )
-                else:
-                    _messages[idx] = None
-            messages.extend(list(filter(None, _messages)))
+            # Remove the end of text character, then split into reports,
+            # collapsing all whitespace (including new lines) to single
+            # spaces and skipping empty reports
+            d = d.replace("\x03", "")
+            for report in d.split("="):
+                groups = report.split()
+                if groups:
+                    messages.append(f"{s0} {' '.join(groups)}")
 
     # Check any messages were actually extracted
     if messages == []:
-        raise Exception(("No SYNOP reports were extracted."
-                         " Perhaps the date group YYGGiw"
-                         " is missing."))
+        raise ValueError(("No SYNOP reports were extracted."
+                          " Perhaps the date group YYGGiw"
+                          " is missing."))
 
     # Return the messages
     return messages
 
 
-def transform(data: str, metadata: str, year: int,
-              month: int) -> Iterator[dict]:
+def parse_metadata(metadata: str) -> list:
+    """
+    Parses the CSV station metadata, returning the metadata of each
+    station in the station list. The result can be passed to `transform`
+    in place of the CSV string, so that the station list only needs to be
+    parsed once when converting many files.
+
+    :param metadata: String containing CSV encoded metadata
+
+    :returns: `list` of `dict` of the metadata of each station
+    """
+
+    fh = StringIO(metadata)
+    reader = csv.reader(fh, delimiter=',', quoting=csv.QUOTE_MINIMAL)
+    col_names = next(reader)
+    stations = [dict(zip(col_names, row)) for row in reader if len(row) > 0]
+    fh.close()
+
+    return stations
+
+
+def _failure_result(warning_msgs: list, error_msgs: list) -> dict:
+    """
+    Builds the result yielded by `transform` for a report that could not
+    be converted to BUFR
+
+    :param warning_msgs: Array of warning messages for the report
+    :param error_msgs: Array of error messages for the report
+
+    :returns: `dict` with the `_meta` of the failed conversion
+    """
+
+    return {
+        "_meta": {
+            "id": None,
+            "geometry": None,
+            "properties": {
+                "md5": None,
+                "wigos_station_identifier": None,
+                "datetime": None,
+                "originating_centre": None,
+                "data_category": None
+            },
+            "result": {
+                "code": FAILED,
+                "message": "Error encoding, BUFR set to None",
+                "warnings": warning_msgs,
+                "errors": error_msgs
+            },
+            "template": None,
+            "csv": None
+        }
+    }
+
+
+def transform(data: str, metadata: Union[str, list], year: int,
+              month: int, write_csv: bool = True) -> Iterator[dict]:
     """
     Convert SYNOP encoded observations to BUFR
 
     :param data: String containing the data to encode
-    :param metadata: String containing CSV encoded metadata
+    :param metadata: String containing CSV encoded metadata, or `list`
+                     of station metadata returned by `parse_metadata`
     :param year: year (`int`)
     :param month: month (`int`)
+    :param write_csv: whether to write the decoded report to the CSV string
+                      in `_meta`, otherwise it is set to `None` (`bool`)
 
     :returns: iterator
     """
-    # =============================================
-    # Make warning and error messages array global
-    # =============================================
-    global warning_msgs
-    global error_msgs
+
+    conversion = _transform(data, metadata, year, month, write_csv)
+
+    # The warning and error message arrays of this conversion, which are
+    # only set in the context while the conversion runs
+    messages = ([], [])
+    try:
+        while True:
+            warning_token = _warning_msgs.set(messages[0])
+            error_token = _error_msgs.set(messages[1])
+            try:
+                result = next(conversion)
+            except StopIteration:
+                return
+            finally:
+                messages = (_warning_msgs.get(), _error_msgs.get())
+                _warning_msgs.reset(warning_token)
+                _error_msgs.reset(error_token)
+            yield result
+    finally:
+        conversion.close()
+
+
+def _transform(data: str, metadata: Union[str, list], year: int,
+               month: int, write_csv: bool) -> Iterator[dict]:
+    """
+    Converts SYNOP encoded observations to BUFR, see `transform`. The
+    warning and error message arrays of the conversion must be set in the
+    context while this generator runs.
+
+    :param data: String containing the data to encode
+    :param metadata: String containing CSV encoded metadata, or `list`
+                     of station metadata returned by `parse_metadata`
+    :param year: year (`int`)
+    :param month: month (`int`)
+    :param write_csv: whether to write the decoded report to the CSV string
+
+    :returns: iterator
+    """
+    # =====================================================
+    # Get warning and error messages array of this context
+    # =====================================================
+    warning_msgs, error_msgs = _get_messages()
 
     # Boolean to ensure environment variable warning is only displayed once
     # Note: The resetting of the warning_msgs array for
@@ -1295,38 +1310,40 @@ def transform(data: str, metadata: str, year: int,
     # to the first conversion
     can_var_info_be_displayed = True
 
+    # CSV object in memory, reused for each report
+    csv_object = StringIO()
+    csv_writer = csv.writer(csv_object)
+
     # ===================
     # First parse metadata file
     # ===================
     if isinstance(metadata, str):
-        fh = StringIO(metadata)
-        reader = csv.reader(fh, delimiter=',', quoting=csv.QUOTE_MINIMAL)
-        col_names = next(reader)
-        metadata_dict = {}
-        tsi_mapping = {}
-        for row in reader:
-            if len(row) == 0:
-                continue
-            single_row = dict(zip(col_names, row))
-            tsi = single_row['traditional_station_identifier']
-            try:
-                wsi = single_row['wigos_station_identifier']
-                metadata_dict[wsi] = deepcopy(single_row)
-                if tsi in tsi_mapping:
-                    LOGGER.warning(("Duplicate entries found for station"
-                                    f" {tsi} in station list file"))
-                    warning_msgs.append(("Duplicate entries found for station"
-                                        f" {tsi} in station list file"))
-                tsi_mapping[tsi] = wsi
-            except Exception as e:
-                LOGGER.error(e)
-                error_msgs.append(str(e))
-
-        fh.close()
+        stations = parse_metadata(metadata)
+    elif isinstance(metadata, list):
+        stations = metadata
     else:
         LOGGER.error("Invalid metadata")
         raise ValueError("Invalid metadata")
 
+    # Map the WSI to the station metadata, and the traditional station
+    # identifiers to the WSI
+    metadata_dict = {}
+    tsi_mapping = {}
+    for station in stations:
+        tsi = station['traditional_station_identifier']
+        try:
+            wsi = station['wigos_station_identifier']
+            metadata_dict[wsi] = station
+            if tsi in tsi_mapping:
+                LOGGER.warning(("Duplicate entries found for station"
+                                f" {tsi} in station list file"))
+                warning_msgs.append(("Duplicate entries found for station"
+                                    f" {tsi} in station list file"))
+            tsi_mapping[tsi] = wsi
+        except Exception as e:
+            LOGGER.error(e)
+            error_msgs.append(str(e))
+
     # ===========================================
     # Split the data by the end of message signal
     # ===========================================
@@ -1349,30 +1366,9 @@ def transform(data: str, metadata: str, year: int,
             LOGGER.error(e)
             error_msgs.append(str(e))
             messages = []  # Fallback to an empty list if no reports extracted
-            yield {
-                "_meta": {
-                    "id": None,
-                    "geometry": None,
-                    "properties": {
-                        "md5": None,
-                        "wigos_station_identifier": None,
-                        "datetime": None,
-                        "originating_centre": None,
-                        "data_category": None
-                    },
-                    "result": {
-                        "code": FAILED,
-                        "message": "Error encoding, BUFR set to None",
-                        "warnings": warning_msgs,
-                        "errors": error_msgs
-                    },
-                    "template": None,
-                    "csv": None
-                }
-            }
+            yield _failure_result(warning_msgs, error_msgs)
             # Reset warning and error messages array for next iteration
-            warning_msgs = []
-            error_msgs = []
+            warning_msgs, error_msgs = _reset_messages()
 
         # Count how many conversions were successful using a dictionary
         conversion_success = {}
@@ -1385,9 +1381,11 @@ def transform(data: str, metadata: str, year: int,
                 continue
 
             # Check data is just a NIL report, if so warn the user and do
-            # not create an empty BUFR file
-            nil_pattern = r"^[A-Za-z]{4} \d{5} (\d{5}) [Nn][Il][Ll]$"
-            match = re.match(nil_pattern, message)
+            # not create an empty BUFR file. The data has been converted to
+            # upper case, so only reports ending in NIL can match
+            match = None
+            if message.endswith(" NIL"):
+                match = _NIL_RE.match(message)
             if match:
                 LOGGER.warning(
                     f"NIL report detected for station {match.group(1)}, no BUFR file created.")  # noqa
@@ -1409,80 +1407,34 @@ def transform(data: str, metadata: str, year: int,
                 LOGGER.error(
                     f"Error parsing SYNOP report: {message}. {str(e)}!")
                 error_msgs.append(f"Error parsing SYNOP report: {message}. {str(e)}!")  # noqa
-                result = {
-                    "_meta": {
-                        "id": None,
-                        "geometry": None,
-                        "properties": {
-                            "md5": None,
-                            "wigos_station_identifier": None,
-                            "datetime": None,
-                            "originating_centre": None,
-                            "data_category": None
-                        },
-                        "result": {
-                            "code": FAILED,
-                            "message": "Error encoding, BUFR set to None",
-                            "warnings": warning_msgs,
-                            "errors": error_msgs
-                        },
-                        "template": None,
-                        "csv": None
-                    }
-                }
+                result = _failure_result(warning_msgs, error_msgs)
                 yield result
                 # Reset warning and error messages array for next iteration
-                warning_msgs = []
-                error_msgs = []
+                warning_msgs, error_msgs = _reset_messages()
                 continue
 
             # Now determine and load the appropriate mappings
             # file depending on the value of the wind indicator.
             # This will be updated for each message.
             bufr_template = msg['template']
-            if bufr_template == 307096:
-                # Get mapping template, this needs to be
-                # reloaded everytime as each SYNOP can have a
-                # different number of replications
-                mapping = deepcopy(_mapping_307096)
-            else:
-                # Get mapping template, this needs to be
-                # reloaded everytime as each SYNOP can have a
-                # different number of replications
-                mapping = deepcopy(_mapping_307080)
+            # Get mapping template, this needs to be
+            # reloaded everytime as each SYNOP can have a
+            # different number of replications
+            mapping = _copy_mapping(_load_mapping(
+                MAPPINGS.get(bufr_template, MAPPINGS_307080)))
 
             # set WSI
             try:
                 wsi = tsi_mapping[tsi]
             except Exception:
                 conversion_success[tsi] = False
-                LOGGER.warning(f"Station {tsi} not found in station file")
-                warning_msgs.append(f"Station {tsi} not found in station file")
-                result = {
-                    "_meta": {
-                        "id": None,
-                        "geometry": None,
-                        "properties": {
-                            "md5": None,
-                            "wigos_station_identifier": None,
-                            "datetime": None,
-                            "originating_centre": None,
-                            "data_category": None
-                        },
-                        "result": {
-                            "code": FAILED,
-                            "message": "Error encoding, BUFR set to None",
-                            "warnings": warning_msgs,
-                            "errors": error_msgs
-                        },
-                        "template": None,
-                        "csv": None
-                    }
-                }
+                warning = f"Station {tsi} not found in station file"
+                LOGGER.warning(warning)
+                warning_msgs.append(warning)
+                result = _failure_result(warning_msgs, error_msgs)
                 yield result
                 # Reset warning and error messages array for next iteration
-                warning_msgs = []
-                error_msgs = []
+                warning_msgs, error_msgs = _reset_messages()
                 continue
 
             def truncate_to_twenty(name: str) -> str:
@@ -1507,12 +1459,13 @@ def transform(data: str, metadata: str, year: int,
                 wsi_series, wsi_issuer, wsi_issue_number, wsi_local = wsi.split("-")   # noqa
 
                 # get other required metadata
+                station_metadata = metadata_dict[wsi]
                 station_name = truncate_to_twenty(
-                    metadata_dict[wsi]["station_name"])
-                latitude = metadata_dict[wsi]["latitude"]
-                longitude = metadata_dict[wsi]["longitude"]
-                station_height = metadata_dict[wsi]["elevation"]
-                barometer_height = metadata_dict[wsi]["barometer_height"]
+                    station_metadata["station_name"])
+                latitude = station_metadata["latitude"]
+                longitude = station_metadata["longitude"]
+                station_height = station_metadata["elevation"]
+                barometer_height = station_metadata["barometer_height"]
 
                 # add these values to the data dictionary
                 msg['_wsi_series'] = wsi_series
@@ -1524,22 +1477,24 @@ def transform(data: str, metadata: str, year: int,
                 msg['_longitude'] = longitude
                 msg['_station_height'] = station_height
                 msg['_barometer_height'] = barometer_height
-                conversion_success[tsi] = True
+                converted = True
             except Exception:
-                conversion_success[tsi] = False
+                converted = False
 
                 if wsi == "":
-                    LOGGER.warning(f"Missing WSI for station {tsi}")
-                    warning_msgs.append(f"Missing WSI for station {tsi}")
+                    warning = f"Missing WSI for station {tsi}"
+                    LOGGER.warning(warning)
+                    warning_msgs.append(warning)
                 else:
                     # If station has not been found in the station
                     # list, don't repeat warning unnecessarily
                     if f"Station {tsi} not found in station file" not in warning_msgs:  # noqa
-                        LOGGER.warning(f"Invalid metadata for station {tsi} found in station file, unable to parse")  # noqa
-                        warning_msgs.append(f"Invalid metadata for station {tsi} found in station file, unable to parse")  # noqa
+                        warning = f"Invalid metadata for station {tsi} found in station file, unable to parse"  # noqa
+                        LOGGER.warning(warning)
+                        warning_msgs.append(warning)
 
             # Add information to the mappings
-            if conversion_success[tsi]:
+            if converted:
                 # First check if the BUFR header centre
                 # and subcentre codes are present
                 missing_env_vars = []
@@ -1576,54 +1531,20 @@ def transform(data: str, metadata: str, year: int,
                     # Stop duplicated warnings
                     can_var_info_be_displayed = False
 
-                # Define a new method which handles the updating of
-                # the mapping file with section 3 and 4 cloud data
-                def update_data_mapping(mapping: list, update: dict):
-                    match = False
-                    for idx in range(len(mapping)):
-                        if mapping[idx]['eccodes_key'] == update['eccodes_key']:  # noqa
-                            match = True
-                            break
-                    if match:
-                        mapping[idx] = update
-                    else:
-                        mapping.append(update)
-                    return mapping
-
                 # Now we add the mappings for the cloud groups
                 # of section 3 and 4
                 try:
+                    cloud_mappings = []
 
                     # Now add the rest of the mappings for section 3 clouds
                     for idx in range(num_s3_clouds):
-                        # Build the dictionary of mappings for section 3
-                        # group 8NsChshs
-
-                        # NOTE: The following keys have been used
-                        # before so the replicator has to be increased:
-                        # - cloudAmount: used 2 times (Nh, Ns)
-                        # - cloudType: used 4 times (CL, CM, CH, C)
-                        # - heightOfBaseOfCloud: used 1 time (h)
-                        # - verticalSignificance: used 7 times (for N,
-                        # low-high cloud amount, low-high cloud drift)
-                        s3_mappings = [
-                            {"eccodes_key":
-                                f"#{idx+6}#verticalSignificanceSurfaceObservations",  # noqa
-                                "value": f"data:vs_s3_{idx+1}"},
-                            {"eccodes_key": f"#{idx+2}#cloudAmount",
-                                "value": f"data:cloud_amount_s3_{idx+1}",
-                                "valid_min": "const:0",
-                                "valid_max": "const:8"},
-                            {"eccodes_key": f"#{idx+5}#cloudType",
-                                "value": f"data:cloud_genus_s3_{idx+1}"},
-                            {"eccodes_key": f"#{idx+2}#heightOfBaseOfCloud",
-                                "value": f"data:cloud_height_s3_{idx+1}"}
-                        ]
-                        for m in s3_mappings:
-                            mapping['data'] = update_data_mapping(
-                                mapping=mapping['data'], update=m)
+                        cloud_mappings.extend(_s3_cloud_mappings(idx))
+
+                    # Now add the rest of the mappings for section 4 clouds,
+                    # the station height is only needed for these groups
+                    if num_s4_clouds > 0:
+                        station_level = int(station_height)
 
-                    # Now add the rest of the mappings for section 4 clouds
                     for idx in range(num_s4_clouds):
                         # Based upon the station height metadata, the
                         # value of vertical significance for section 4
@@ -1635,68 +1556,38 @@ def transform(data: str, metadata: str, year: int,
                         # have vertical significance code 11.
                         cloud_top_height = msg[f'cloud_height_s4_{idx+1}']
 
-                        if cloud_top_height > int(station_height):
+                        if cloud_top_height > station_level:
                             vs_s4 = 10
                         else:
                             vs_s4 = 11
 
-                        # NOTE: Some of the ecCodes keys are used in
-                        # the above, so we must add 'num_s3_clouds'
-                        s4_mappings = [
-                            {"eccodes_key":
-                                f"#{idx+num_s3_clouds+6}#verticalSignificanceSurfaceObservations",  # noqa
-                                "value": f"const:{vs_s4}"},
-                            {"eccodes_key":
-                                f"#{idx+num_s3_clouds+2}#cloudAmount",
-                                "value": f"data:cloud_amount_s4_{idx+1}",
-                                "valid_min": "const:0",
-                                "valid_max": "const:8"},
-                            {"eccodes_key":
-                                f"#{idx+num_s3_clouds+5}#cloudType",
-                                "value": f"data:cloud_genus_s4_{idx+1}"},
-                            {"eccodes_key":
-                                f"#{idx+1}#heightOfTopOfCloud",
-                                "value": f"data:cloud_height_s4_{idx+1}"},
-                            {"eccodes_key":
-                                f"#{idx+1}#cloudTopDescription",
-                                "value": f"data:cloud_top_s4_{idx+1}"}
-                        ]
-                        for m in s4_mappings:
-                            mapping['data'] = update_data_mapping(
-                                mapping=mapping['data'], update=m)
+                        cloud_mappings.extend(
+                            _s4_cloud_mappings(idx, num_s3_clouds, vs_s4))
+
+                    _update_data_mapping(mapping['data'], cloud_mappings)
                 except Exception as e:
                     LOGGER.error(e)
                     LOGGER.error(f"Missing station height for station {tsi}")
                     error_msgs.append(
                         f"Missing station height for station {tsi}")
-                    conversion_success[tsi] = False
+                    converted = False
 
-            if conversion_success[tsi]:
+            if converted:
                 # At this point we have a dictionary for the data, a
                 # dictionary of the mappings and the metadata
                 # The last step is to convert to BUFR.
-                unexpanded_descriptors = [301150, bufr_template]
-                short_delayed_replications = []
-                # update replications
-                delayed_replications = [num_s3_clouds, num_s4_clouds]
-                extended_delayed_replications = []
-                table_version = 37
                 try:
                     # create new BUFR msg
-                    message = BUFRMessage(
-                        unexpanded_descriptors,
-                        short_delayed_replications,
-                        delayed_replications,
-                        extended_delayed_replications,
-                        table_version)
+                    message = _new_bufr_message(
+                        bufr_template, num_s3_clouds, num_s4_clouds)
                 except Exception as e:
                     LOGGER.error(e)
                     LOGGER.error("Error creating BUFRMessage")
                     error_msgs.append(str(e))
                     error_msgs.append("Error creating BUFRMessage")
-                    conversion_success[tsi] = False
+                    converted = False
 
-            if conversion_success[tsi]:
+            if converted:
                 # Parse
                 try:
                     # Parse to BUFRMessage object
@@ -1706,31 +1597,40 @@ def transform(data: str, metadata: str, year: int,
                     LOGGER.error("Error parsing message")
                     error_msgs.append(str(e))
                     error_msgs.append("Error parsing message")
-                    conversion_success[tsi] = False
-
-            if conversion_success[tsi]:
-                # Convert to BUFR
-
-                # Use WSI and observation date as identifier
-                isodate = message.get_datetime().strftime('%Y%m%dT%H%M%S')
+                    converted = False
 
-                # Write message to CSV object in memory
+            if converted:
+                # Use WSI and observation date as identifier, an invalid
+                # date fails this report rather than the whole file
                 try:
-                    csv_object = StringIO()
-                    dict_writer = csv.DictWriter(csv_object, msg.keys())
-
-                    # Add headers
-                    dict_writer.writeheader()
+                    obs_datetime = message.get_datetime()
+                    isodate = obs_datetime.strftime('%Y%m%dT%H%M%S')
+                except Exception as e:
+                    LOGGER.error(e)
+                    LOGGER.error("Error getting observation date")
+                    error_msgs.append(str(e))
+                    error_msgs.append("Error getting observation date")
+                    converted = False
 
-                    # Write data to rows
-                    dict_writer.writerow(msg)
+            if converted:
+                # Convert to BUFR
 
-                    # Get string from CSV object
-                    csv_string = csv_object.getvalue()
-                except Exception:
-                    LOGGER.warning(
-                        f"Unable to write report of station {tsi} to CSV")
-                    warning_msgs.append(f"Unable to write report of station {tsi} to CSV")  # noqa
+                # Write message to CSV object in memory
+                csv_string = None
+                if write_csv:
+                    try:
+                        csv_object.seek(0)
+                        csv_object.truncate()
+
+                        # Add headers and the data row
+                        csv_writer.writerows((msg.keys(), msg.values()))
+
+                        # Get string from CSV object
+                        csv_string = csv_object.getvalue()
+                    except Exception:
+                        LOGGER.warning(
+                            f"Unable to write report of station {tsi} to CSV")  # noqa
+                        warning_msgs.append(f"Unable to write report of station {tsi} to CSV")  # noqa
 
                 try:
                     result["bufr4"] = message.as_bufr()  # encode to BUFR
@@ -1750,9 +1650,10 @@ def transform(data: str, metadata: str, year: int,
                         "warnings": warning_msgs,
                         "errors": error_msgs
                     }
-                    conversion_success[tsi] = False
+                    converted = False
 
                 rmk = f"WIGOS_{wsi}_{isodate}"
+                get_element = message.get_element
 
                 # now additional metadata elements
                 result["_meta"] = {
@@ -1760,17 +1661,17 @@ def transform(data: str, metadata: str, year: int,
                     "geometry": {
                         "type": "Point",
                         "coordinates": [
-                            message.get_element('#1#longitude'),
-                            message.get_element('#1#latitude')
+                            get_element('#1#longitude'),
+                            get_element('#1#latitude')
                         ]
                     },
                     "properties": {
                         "md5": message.md5(),
                         "wigos_station_identifier": wsi,
-                        "datetime": message.get_datetime(),
+                        "datetime": obs_datetime,
                         "originating_centre":
-                        message.get_element("bufrHeaderCentre"),
-                        "data_category": message.get_element("dataCategory")
+                        get_element("bufrHeaderCentre"),
+                        "data_category": get_element("dataCategory")
                     },
                     "result": status,
                     "template": bufr_template,
@@ -1779,43 +1680,25 @@ def transform(data: str, metadata: str, year: int,
             # If there were errors before conversion to BUFR, yield
             # an object with the _meta key
             else:
-                result = {
-                    "_meta": {
-                        "id": None,
-                        "geometry": None,
-                        "properties": {
-                            "md5": None,
-                            "wigos_station_identifier": None,
-                            "datetime": None,
-                            "originating_centre": None,
-                            "data_category": None
-                        },
-                        "result": {
-                            "code": FAILED,
-                            "message": "Error encoding, BUFR set to None",
-                            "warnings": warning_msgs,
-                            "errors": error_msgs
-                        },
-                        "template": None,
-                        "csv": None
-                    }
-                }
+                result = _failure_result(warning_msgs, error_msgs)
+
+            # Record the outcome for the station once the report is done
+            conversion_success[tsi] = converted
 
             # Now yield result back to caller
             yield result
 
             # Reset warning and error messages array for next iteration
-            warning_msgs = []
-            error_msgs = []
+            warning_msgs, error_msgs = _reset_messages()
 
             # Output conversion status to user
-            if conversion_success[tsi]:
+            if converted:
                 LOGGER.info(f"Station {tsi} report converted")
             else:
                 LOGGER.info(f"Station {tsi} report failed to convert")
 
         # calculate number of successful conversions
-        conversion_count = sum(tsi for tsi in conversion_success.values())
+        conversion_count = sum(conversion_success.values())
 
         # Log number of messages converted
         LOGGER.info((f"{conversion_count} / {len(messages)}"
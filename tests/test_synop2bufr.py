@@ -21,7 +21,9 @@
 
 import pytest
 import logging
-from synop2bufr import extract_individual_synop, parse_synop, transform
+from synop2bufr import (extract_individual_synop, parse_metadata,
+                        parse_synop, transform)
+from synop2bufr import _bufr_template, _new_bufr_message
 
 LOGGER = logging.getLogger(__name__)
 
@@ -179,6 +181,88 @@ def test_bufr_307096(multiple_reports_307096, metadata_string):
     assert msgs['WIGOS_0-20000-0-15090_20220321T120000']['_meta']['template'] == 307096  # noqa
 
 
+def test_parsed_metadata(multiple_reports_307080, metadata_string):
+    metadata = parse_metadata(metadata_string)
+    assert len(metadata) == 3
+    assert metadata[1]['station_name'] == 'BOTOSANI'
+    assert metadata[1]['wigos_station_identifier'] == '0-20000-0-15020'
+
+    result = transform(
+        multiple_reports_307080, metadata, 2022, 3
+    )
+    msgs = {}
+    for item in result:
+        msgs[item['_meta']['id']] = item
+    # The parsed metadata should give the same BUFR as the CSV string
+    assert msgs['WIGOS_0-20000-0-15015_20220321T120000']['_meta']['properties']['md5'] == 'deb294033aee19f090aabc63660f273c'  # noqa
+    assert msgs['WIGOS_0-20000-0-15020_20220321T120000']['_meta']['properties']['md5'] == 'ef62c7b58ddc99724a585d6cd9b16628'  # noqa
+    assert msgs['WIGOS_0-20000-0-15090_20220321T120000']['_meta']['properties']['md5'] == '7fc119bab009baf45bbbb49e0b3dd5fd'  # noqa
+
+
+def test_duplicate_wsi(multiple_reports_307080, metadata_string):
+    # Two traditional identifiers with the same WSI should both convert
+    md = metadata_string.replace("BOTOSANI,0-20000-0-15020,15020",
+                                 "BOTOSANI,0-20000-0-15090,15020")
+    metadata = parse_metadata(md)
+
+    for item in transform(multiple_reports_307080, metadata, 2022, 3):
+        assert item['bufr4'] is not None
+        assert item['_meta']['properties']['wigos_station_identifier'] != '0-20000-0-15020'  # noqa
+
+
+def test_duplicate_tsi_warning(multiple_reports_307080, metadata_string):
+    # The duplicate station warning is given by transform, so that it
+    # is returned with the reports even when the metadata is pre-parsed
+    md = metadata_string + "\nBOTOSANI 2,0-20000-0-15021,15020,Land (fixed),47.73565324,26.64555017,161,162.2,Romania,6"  # noqa
+    metadata = parse_metadata(md)
+
+    result = next(transform(multiple_reports_307080, metadata, 2022, 3))
+    assert "Duplicate entries found for station 15020 in station list file" in result['_meta']['result']['warnings']  # noqa
+
+
+def test_no_csv(multiple_reports_307080, metadata_string):
+    result = transform(
+        multiple_reports_307080, metadata_string, 2022, 3, write_csv=False
+    )
+    msgs = {}
+    for item in result:
+        assert item['_meta']['csv'] is None
+        msgs[item['_meta']['id']] = item
+    # Only the CSV is skipped, the BUFR should be unchanged
+    assert msgs['WIGOS_0-20000-0-15015_20220321T120000']['_meta']['properties']['md5'] == 'deb294033aee19f090aabc63660f273c'  # noqa
+    assert msgs['WIGOS_0-20000-0-15020_20220321T120000']['_meta']['properties']['md5'] == 'ef62c7b58ddc99724a585d6cd9b16628'  # noqa
+    assert msgs['WIGOS_0-20000-0-15090_20220321T120000']['_meta']['properties']['md5'] == '7fc119bab009baf45bbbb49e0b3dd5fd'  # noqa
+
+
+def test_bufr_message_copies():
+    # Messages copied from the cached template must not share any
+    # mutable state, or values would leak between reports
+    first = _new_bufr_message(307080, 1, 1)
+    second = _new_bufr_message(307080, 1, 1)
+    first.set_element('#1#blockNumber', 15)
+    assert second.get_element('#1#blockNumber') is None
+    assert _bufr_template(307080, 1, 1).get_element('#1#blockNumber') is None  # noqa
+
+    containers = (list, dict, set, bytearray)
+    for name, value in vars(first).items():
+        if isinstance(value, containers):
+            assert value is not getattr(second, name)
+
+
+def test_interleaved_messages(multiple_reports_307080, metadata_string):
+    # Warnings of reports parsed outside of transform are not kept
+    parse_synop("AAXX 31001 78366 01/00 92404 10191 20191 38900 48426 51010 69921 74596 89/// 333 10221 20176 31/// 59001 69917 70021", 2022, 3)  # noqa
+
+    # Two conversions running in turn must not share their warnings
+    md = metadata_string + "\nBOTOSANI 2,0-20000-0-15021,15020,Land (fixed),47.73565324,26.64555017,161,162.2,Romania,6"  # noqa
+    first = transform(multiple_reports_307080, md, 2022, 3)
+    second = transform(multiple_reports_307080, metadata_string, 2022, 3)
+    first_result = next(first)
+    second_result = next(second)
+    assert len(first_result['_meta']['result']['warnings']) == 1
+    assert second_result['_meta']['result']['warnings'] == []
+
+
 def test_invalid_separation():
 
     missing_delimiter = """AAXX 21121